@@ -1,14 +1,16 @@
 """Main FastAPI application for Justice Made Clear."""
 from __future__ import annotations
 
-import base64
-from typing import List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
 
 from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError
 
 from . import dependencies, schemas
+from .clients import llm_client
 from .config import Settings, get_settings
 from .services.classification_service import ClassificationService
 from .services.ingest_service import IngestService
@@ -18,9 +20,16 @@ from .services.safety_check_service import SafetyCheckService
 from .services.simplification_service import SimplificationService
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Close the pooled async LLM HTTP client when the server shuts down."""
+    yield
+    await llm_client.aclose_async_http_client()
+
+
 def _configure_app(settings: Settings) -> FastAPI:
     """Instantiate FastAPI with CORS middleware."""
-    app = FastAPI(title=settings.api_title, version=settings.api_version)
+    app = FastAPI(title=settings.api_title, version=settings.api_version, lifespan=_lifespan)
 
     origins = [origin.strip() for origin in settings.backend_cors_origins.split(",") if origin.strip()]
     if not origins:
@@ -74,12 +83,19 @@ async def process_document_endpoint(
     """Process uploaded/legal text documents end-to-end."""
     document_input = await _parse_document_input(request)
 
-    ingest_result = ingest_service.ingest(document_input)
-    segmented_document = normalization_service.normalize(ingest_result)
-    classification = classification_service.classify(segmented_document)
-    simplification = simplification_service.simplify(segmented_document, classification)
-    legal_guide = legal_guide_service.build_guide(segmented_document, classification, simplification)
-    safety = safety_check_service.evaluate(segmented_document, simplification, legal_guide)
+    # The stages depend on each other, so they run in order; the blocking ones
+    # go to the threadpool and the simplification awaits the async LLM client,
+    # keeping the event loop free for other requests.
+    ingest_result = await run_in_threadpool(ingest_service.ingest, document_input)
+    segmented_document = await run_in_threadpool(normalization_service.normalize, ingest_result)
+    classification = await run_in_threadpool(classification_service.classify, segmented_document)
+    simplification = await simplification_service.asimplify(segmented_document, classification)
+    legal_guide = await run_in_threadpool(
+        legal_guide_service.build_guide, segmented_document, classification, simplification
+    )
+    safety = await run_in_threadpool(
+        safety_check_service.evaluate, segmented_document, simplification, legal_guide
+    )
 
     warnings = _merge_warnings(simplification.warnings, safety)
 
@@ -102,11 +118,8 @@ async def _parse_document_input(request: Request) -> schemas.DocumentInput:
         plain_text = form.get("plainText") or form.get("plain_text")
         upload = form.get("file")
 
-        if upload is not None:
-            file_bytes = await upload.read()
-            file_content = base64.b64encode(file_bytes).decode("utf-8")
-        else:
-            file_content = None
+        # Raw bytes go straight to ingestion; no base64 round-trip needed.
+        file_content = await upload.read() if upload is not None else None
 
         data = {
             "sourceType": source_type,
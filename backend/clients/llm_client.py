@@ -1,14 +1,31 @@
 """Provider-agnostic LLM client implementations."""
 from __future__ import annotations
 
+import asyncio
 import json
 import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .. import schemas
+from ..utils.content_cache import DiskCache, content_key
+
+# Optional faster JSON decoder for LLM payloads; the stdlib is the fallback.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+# Optional async HTTP transport for DeepSeekLLMClient.achat; without it the
+# sync client runs in a worker thread.
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore
 
 # This value is used only to detect obviously unset keys; keep it unique
 # and never equal to a real credential.
@@ -19,6 +36,60 @@ class LLMClientError(RuntimeError):
     """Raised when the LLM provider cannot satisfy a request."""
 
 
+def _json_loads(text: str) -> Any:
+    """Decode JSON with orjson when installed.
+
+    orjson is stricter than the stdlib (no NaN, 64-bit integers only), so
+    anything it rejects is retried with ``json.loads`` to keep the accepted
+    input set unchanged; invalid JSON still raises ``json.JSONDecodeError``.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Process-wide HTTP session shared by every client instance, so TCP/TLS
+# connections to the provider stay alive across calls.
+_HTTP_SESSION = requests.Session()
+# The default pool keeps 10 connections per host; simplify_many and the
+# safety checker run several provider calls in parallel threads. Retries stay
+# in _chat_completion so they are not multiplied by urllib3's.
+_HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+# Async counterpart: an httpx.AsyncClient is bound to the event loop it first
+# connects on, so there is one pooled client per running loop. Weak keys let
+# clients of discarded loops (asyncio.run in scripts/tests) go away with them.
+ASYNC_MAX_CONNECTIONS = 32
+_ASYNC_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def _async_http_client() -> "httpx.AsyncClient":
+    """Return the pooled AsyncClient of the running event loop, creating it once."""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_HTTP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_MAX_CONNECTIONS,
+            )
+        )
+        _ASYNC_HTTP_CLIENTS[loop] = client
+    return client
+
+
+async def aclose_async_http_client() -> None:
+    """Close the running loop's pooled AsyncClient (e.g. on app shutdown)."""
+    client = _ASYNC_HTTP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
 class BaseLLMClient(ABC):
     """Abstract interface implemented by every model provider."""
 
@@ -59,30 +130,108 @@ class BaseLLMClient(ABC):
     ) -> Dict[str, Any]:
         """Return a dict describing potential safety issues."""
 
+    def _parse_json(self, payload: str) -> Dict[str, Any]:
+        """Parse JSON strictly by default. If the client settings enable
+        tolerant parsing (settings['tolerant_parse']=True), attempt to extract
+        a JSON object from surrounding text or code fences.
+        """
+        if not isinstance(payload, str):
+            raise LLMClientError("LLM response was not a string payload")
 
-class DeepSeekLLMClient(BaseLLMClient):
-    """Concrete implementation backed by DeepSeek's OpenAI-compatible API."""
+        p = payload.strip()
+        # Strict parse first
+        try:
+            return _json_loads(p)
+        except json.JSONDecodeError:
+            # If tolerant parsing is enabled in settings, try to extract the
+            # first JSON object within the string (handles code fences).
+            if self._settings.get("tolerant_parse"):
+                # Decode the first object in place: raw_decode stops at its
+                # closing brace, so code fences and trailing commentary are
+                # ignored without searching for the last "}" and re-slicing.
+                start = p.find("{")
+                if start != -1:
+                    try:
+                        return _JSON_DECODER.raw_decode(p, start)[0]
+                    except json.JSONDecodeError:
+                        pass
+
+        # If we reach here, parsing failed — include a short snippet for debugging
+        snippet = (p or "")[:600]
+        raise LLMClientError(f"LLM response was not valid JSON. Snippet: {snippet}")
+
+
+class ChatCompletionLLMClient(BaseLLMClient):
+    """Shared prompt logic for providers exposing a system/user chat completion.
+
+    Subclasses only implement ``_chat_completion``; classification, guide and
+    verifier prompts live here and JSON parsing comes from BaseLLMClient.
+    """
 
     def __init__(self, settings: Dict[str, Any]):
         super().__init__(settings)
-        self._base_url = (settings.get("llm_base_url") or "https://api.deepseek.com").rstrip("/")
-        self._model = settings.get("llm_model_name", "deepseek-chat")
-        self._api_key = settings.get("llm_api_key") or PLACEHOLDER_API_KEY
-        self._timeout = int(settings.get("llm_timeout", 60))
-        self._retries = max(1, int(settings.get("llm_retries", 1)))
         self._max_tokens = settings.get("llm_max_tokens")
         self._classification_temperature = float(settings.get("classification_temperature", 0.0))
         self._simplification_temperature = float(settings.get("simplification_temperature", 0.3))
         self._guide_temperature = float(settings.get("guide_temperature", 0.25))
         self._safety_temperature = float(settings.get("safety_temperature", 0.0))
+        cache_dir = settings.get("llm_cache_dir")
+        self._disk_cache = DiskCache(cache_dir) if cache_dir else None
 
     def chat(self, system_prompt: str, user_prompt: str, temperature: float) -> str:
         """Provider-agnostic chat entry used by services with centralized prompts."""
-        return self._chat_completion(system_prompt=system_prompt, user_prompt=user_prompt, temperature=temperature)
+        return self._complete(system_prompt, user_prompt, temperature)
+
+    def _response_key(self, system_prompt: str, user_prompt: str, temperature: float, task: str) -> bytes:
+        return content_key(
+            self.provider_name,
+            self._settings.get("llm_model_name"),
+            self._settings.get("llm_local_model_path"),
+            task,
+            repr(temperature),
+            system_prompt,
+            user_prompt,
+        )
 
-    @property
-    def provider_name(self) -> str:  # pragma: no cover - trivial property
-        return "deepseek"
+    def _complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        task: str = "chat",
+    ) -> str:
+        """``_chat_completion`` behind the optional on-disk response cache."""
+        if self._disk_cache is None:
+            return self._chat_completion(
+                system_prompt=system_prompt, user_prompt=user_prompt, temperature=temperature, task=task
+            )
+        key = self._response_key(system_prompt, user_prompt, temperature, task)
+        cached = self._disk_cache.get(key)
+        if cached is not None:
+            return cached
+        raw = self._chat_completion(
+            system_prompt=system_prompt, user_prompt=user_prompt, temperature=temperature, task=task
+        )
+        self._disk_cache.put(key, raw)
+        return raw
+
+    async def achat(self, system_prompt: str, user_prompt: str, temperature: float) -> str:
+        """Awaitable ``chat``; providers without an async transport run it in a worker thread."""
+        return await asyncio.to_thread(self.chat, system_prompt, user_prompt, temperature)
+
+    @abstractmethod
+    def _chat_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        task: str = "chat",
+    ) -> str:
+        """Return the raw assistant message for a single system/user exchange.
+
+        ``task`` names the pipeline step (chat, classification, ...) so local
+        providers can route short-form tasks to a smaller model.
+        """
 
     # ------------------------------------------------------------------
     # Public interface
@@ -107,10 +256,11 @@ class DeepSeekLLMClient(BaseLLMClient):
             f"TEXTO:\n{text[:6000]}"
         )
 
-        payload = self._chat_completion(
+        payload = self._complete(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             temperature=self._classification_temperature,
+            task="classification",
         )
         data = self._parse_json(payload)
 
@@ -144,10 +294,11 @@ class DeepSeekLLMClient(BaseLLMClient):
             f"{text[:8000]}"
         )
 
-        return self._chat_completion(
+        return self._complete(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             temperature=self._simplification_temperature,
+            task="simplification",
         ).strip()
 
     def generate_guide(
@@ -167,10 +318,11 @@ class DeepSeekLLMClient(BaseLLMClient):
             f"TEXTO SIMPLIFICADO:\n{simplified_text[:6000]}"
         )
 
-        payload = self._chat_completion(
+        payload = self._complete(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             temperature=self._guide_temperature,
+            task="guide",
         )
         data = self._parse_json(payload)
 
@@ -203,10 +355,11 @@ class DeepSeekLLMClient(BaseLLMClient):
             f"GUIA:\n{guide_dump}"
         )
 
-        payload = self._chat_completion(
+        payload = self._complete(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             temperature=self._safety_temperature,
+            task="safety",
         )
         data = self._parse_json(payload)
 
@@ -221,6 +374,22 @@ class DeepSeekLLMClient(BaseLLMClient):
             "raw_response": payload,
         }
 
+
+class DeepSeekLLMClient(ChatCompletionLLMClient):
+    """Concrete implementation backed by DeepSeek's OpenAI-compatible API."""
+
+    def __init__(self, settings: Dict[str, Any]):
+        super().__init__(settings)
+        self._base_url = (settings.get("llm_base_url") or "https://api.deepseek.com").rstrip("/")
+        self._model = settings.get("llm_model_name", "deepseek-chat")
+        self._api_key = settings.get("llm_api_key") or PLACEHOLDER_API_KEY
+        self._timeout = int(settings.get("llm_timeout", 60))
+        self._retries = max(1, int(settings.get("llm_retries", 1)))
+
+    @property
+    def provider_name(self) -> str:  # pragma: no cover - trivial property
+        return "deepseek"
+
     # ------------------------------------------------------------------
     # HTTP helper
     # ------------------------------------------------------------------
@@ -229,33 +398,14 @@ class DeepSeekLLMClient(BaseLLMClient):
         system_prompt: str,
         user_prompt: str,
         temperature: float,
+        task: str = "chat",
     ) -> str:
-        if not self._api_key or self._api_key == PLACEHOLDER_API_KEY:
-            raise LLMClientError(
-                "DeepSeek API key missing. Set LLM_API_KEY or DEEPSEEK_API_KEY."
-            )
-
-        payload = {
-            "model": self._model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            "temperature": temperature,
-        }
-        if self._max_tokens:
-            payload["max_tokens"] = int(self._max_tokens)
-
-        url = f"{self._base_url}/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
+        url, headers, payload = self._request_parts(system_prompt, user_prompt, temperature)
 
         last_error: Optional[Exception] = None
         for attempt in range(1, self._retries + 1):
             try:
-                response = requests.post(
+                response = _HTTP_SESSION.post(
                     url,
                     json=payload,
                     headers=headers,
@@ -275,35 +425,67 @@ class DeepSeekLLMClient(BaseLLMClient):
 
         raise LLMClientError(f"DeepSeek request failed: {last_error}")
 
-    def _parse_json(self, payload: str) -> Dict[str, Any]:
-        """Parse JSON strictly by default. If the client settings enable
-        tolerant parsing (settings['tolerant_parse']=True), attempt to extract
-        a JSON object from surrounding text or code fences.
-        """
-        if not isinstance(payload, str):
-            raise LLMClientError("LLM response was not a string payload")
+    async def achat(self, system_prompt: str, user_prompt: str, temperature: float) -> str:
+        """Non-blocking chat over httpx, with the same retries as the sync path."""
+        if httpx is None:
+            return await super().achat(system_prompt, user_prompt, temperature)
 
-        p = payload.strip()
-        # Strict parse first
-        try:
-            return json.loads(p)
-        except json.JSONDecodeError:
-            # If tolerant parsing is enabled in settings, try to extract the
-            # first JSON object within the string (handles code fences).
-            if self._settings.get("tolerant_parse"):
-                cleaned = p.strip()
-                # Remove common code fences like ```json ... ```
-                if cleaned.startswith("```"):
-                    cleaned = cleaned.strip("`")
-                start = cleaned.find("{")
-                end = cleaned.rfind("}")
-                if start != -1 and end != -1 and end > start:
-                    candidate = cleaned[start : end + 1]
-                    try:
-                        return json.loads(candidate)
-                    except json.JSONDecodeError:
-                        pass
+        key = None
+        if self._disk_cache is not None:
+            key = self._response_key(system_prompt, user_prompt, temperature, "chat")
+            cached = self._disk_cache.get(key)
+            if cached is not None:
+                return cached
 
-        # If we reach here, parsing failed — include a short snippet for debugging
-        snippet = (p or "")[:600]
-        raise LLMClientError(f"LLM response was not valid JSON. Snippet: {snippet}")
+        url, headers, payload = self._request_parts(system_prompt, user_prompt, temperature)
+        last_error: Optional[Exception] = None
+        http = _async_http_client()
+        for attempt in range(1, self._retries + 1):
+            try:
+                response = await http.post(url, json=payload, headers=headers, timeout=self._timeout)
+                response.raise_for_status()
+                choices = response.json().get("choices") or []
+                if not choices:
+                    raise LLMClientError("DeepSeek response missing 'choices'.")
+                raw = choices[0]["message"]["content"]
+                break
+            except Exception as exc:  # pragma: no cover - network failure dependent
+                last_error = exc
+                if attempt < self._retries:
+                    await asyncio.sleep(0.25 * attempt)
+        else:
+            raise LLMClientError(f"DeepSeek request failed: {last_error}")
+
+        if key is not None:
+            self._disk_cache.put(key, raw)
+        return raw
+
+    def _request_parts(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Return (url, headers, JSON body) for a chat completion request."""
+        if not self._api_key or self._api_key == PLACEHOLDER_API_KEY:
+            raise LLMClientError(
+                "DeepSeek API key missing. Set LLM_API_KEY or DEEPSEEK_API_KEY."
+            )
+
+        payload = {
+            "model": self._model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": temperature,
+        }
+        if self._max_tokens:
+            payload["max_tokens"] = int(self._max_tokens)
+
+        url = f"{self._base_url}/v1/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+        return url, headers, payload
@@ -0,0 +1,91 @@
+"""Local LLM client backed by llama.cpp GGUF models (llama-cpp-python)."""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional
+
+from .llm_client import ChatCompletionLLMClient, LLMClientError
+
+
+class LocalLlamaCppClient(ChatCompletionLLMClient):
+    """Run the pipeline prompts against quantized models loaded in-process.
+
+    Classification only emits a short JSON object, so it can be routed to a
+    smaller model (``llm_local_classification_model_path``); every other task
+    uses ``llm_local_model_path``. Models are loaded lazily on first use.
+    """
+
+    def __init__(self, settings: Dict[str, Any]):
+        super().__init__(settings)
+        self._model_path: Optional[str] = settings.get("llm_local_model_path")
+        self._classification_model_path: Optional[str] = (
+            settings.get("llm_local_classification_model_path") or self._model_path
+        )
+        self._n_ctx = int(settings.get("llm_local_n_ctx", 8192))
+        self._n_gpu_layers = int(settings.get("llm_local_n_gpu_layers", -1))
+        self._models: Dict[str, Any] = {}
+        # llama.cpp contexts are not safe to share between threads.
+        self._lock = threading.Lock()
+
+    @property
+    def provider_name(self) -> str:  # pragma: no cover - trivial property
+        return "local"
+
+    def _chat_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        task: str = "chat",
+    ) -> str:
+        path = self._classification_model_path if task == "classification" else self._model_path
+        if not path:
+            raise LLMClientError(
+                "Local LLM model missing. Set LLM_LOCAL_MODEL_PATH to a GGUF file."
+            )
+
+        kwargs: Dict[str, Any] = {
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": temperature,
+        }
+        # Plain-text simplification is the only task that does not answer in JSON.
+        if task != "simplification":
+            kwargs["response_format"] = {"type": "json_object"}
+        if self._max_tokens:
+            kwargs["max_tokens"] = int(self._max_tokens)
+
+        with self._lock:
+            model = self._load_model(path)
+            try:
+                response = model.create_chat_completion(**kwargs)
+            except Exception as exc:  # pragma: no cover - backend specific
+                raise LLMClientError(f"Local llama.cpp completion failed: {exc}") from exc
+
+        choices = response.get("choices") or []
+        if not choices:
+            raise LLMClientError("Local llama.cpp response missing 'choices'.")
+        return choices[0]["message"]["content"] or ""
+
+    def _load_model(self, path: str) -> Any:
+        model = self._models.get(path)
+        if model is not None:
+            return model
+
+        try:
+            from llama_cpp import Llama
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise LLMClientError(
+                "The local provider requires 'llama-cpp-python'. Install with: pip install llama-cpp-python"
+            ) from exc
+
+        model = Llama(
+            model_path=path,
+            n_ctx=self._n_ctx,
+            n_gpu_layers=self._n_gpu_layers,
+            verbose=False,
+        )
+        self._models[path] = model
+        return model
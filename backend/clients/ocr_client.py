@@ -2,8 +2,13 @@
 from __future__ import annotations
 
 import io
+import mmap
+import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import BinaryIO, Optional, Union
+
+# Raw bytes, a memory-mapped file, or a path on disk.
+OCRSource = Union[bytes, mmap.mmap, str, "os.PathLike[str]"]
 
 # Attempt to use pypdf, fall back to PyPDF2 when necessary.
 try:
@@ -19,6 +24,16 @@ class OCRClientError(RuntimeError):
     """Raised when the OCR provider cannot process the file."""
 
 
+def _open_source(source: OCRSource) -> Union[BinaryIO, mmap.mmap, str, "os.PathLike[str]"]:
+    """Adapt an OCR source to what pypdf / PIL accept without copying mmaps or paths."""
+    if isinstance(source, (str, os.PathLike)):
+        return source
+    if isinstance(source, mmap.mmap):
+        source.seek(0)
+        return source
+    return io.BytesIO(source)
+
+
 @dataclass
 class OCRService:
     """Provide a consistent interface over different OCR providers."""
@@ -28,29 +43,44 @@ class OCRService:
     # ------------------------------------------------------------------
     # PDF -> TEXT
     # ------------------------------------------------------------------
-    def extract_text_from_pdf(self, pdf_bytes: bytes, language: Optional[str] = None) -> str:
-        """Extract text from PDFs using embedded content when available."""
+    def extract_text_from_pdf(
+        self,
+        pdf_bytes: OCRSource,
+        language: Optional[str] = None,
+        max_chars: Optional[int] = None,
+    ) -> str:
+        """Extract text from PDFs using embedded content when available.
+
+        Pages are separated by a blank line. When ``max_chars`` is given, pages
+        after the one that reaches the limit are not extracted.
+        """
         if pypdf is None:
             raise OCRClientError(
                 "pypdf / PyPDF2 is required for PDF extraction. Install with: pip install pypdf"
             )
 
-        reader = pypdf.PdfReader(io.BytesIO(pdf_bytes))
-        pages_text: list[str] = []
+        reader = pypdf.PdfReader(_open_source(pdf_bytes))
+        # Stream pages into one buffer instead of keeping a per-page list alive
+        # until the final join.
+        buf = io.StringIO()
 
-        for page in reader.pages:
+        for index, page in enumerate(reader.pages):
             try:
                 page_text = page.extract_text() or ""
             except Exception as exc:  # pragma: no cover - backend specific
                 raise OCRClientError(f"Failed to extract text from PDF page: {exc}") from exc
-            pages_text.append(page_text)
+            if index:
+                buf.write("\n\n")
+            buf.write(page_text)
+            if max_chars is not None and buf.tell() >= max_chars:
+                break
 
-        return "\n\n".join(pages_text).strip()
+        return buf.getvalue().strip()
 
     # ------------------------------------------------------------------
     # IMAGE -> TEXT
     # ------------------------------------------------------------------
-    def extract_text_from_image(self, image_bytes: bytes, language: Optional[str] = None) -> str:
+    def extract_text_from_image(self, image_bytes: OCRSource, language: Optional[str] = None) -> str:
         """Extract plain text from images or scanned documents via pytesseract."""
         try:
             from PIL import Image
@@ -60,6 +90,6 @@ class OCRService:
                 "Image OCR requires 'pytesseract' and 'Pillow'. Install with: pip install pytesseract pillow"
             ) from exc
 
-        image = Image.open(io.BytesIO(image_bytes))
+        image = Image.open(_open_source(image_bytes))
         config = f"-l {language}" if language else ""
         return pytesseract.image_to_string(image, config=config)
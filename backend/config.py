@@ -43,14 +43,22 @@ class Settings(BaseSettings):
     llm_request_timeout_seconds: int = 60
     llm_retries: int = 1
     llm_max_tokens: Optional[int] = None
+    # Directory for memoized raw LLM responses (fake-mode harness, dev loops);
+    # unset disables the on-disk cache.
+    llm_cache_dir: Optional[str] = None
     classification_temperature: float = 0.0
     simplification_temperature: float = 0.3
     guide_temperature: float = 0.25
     safety_temperature: float = 0.0
     classification_rule_threshold: float = 0.8
     classification_force_llm_threshold: float = 0.5
+    llm_local_model_path: Optional[str] = None
+    llm_local_classification_model_path: Optional[str] = None
+    llm_local_n_ctx: int = 8192
+    llm_local_n_gpu_layers: int = -1
 
     ocr_provider: str = "tesseract"
+    ocr_max_concurrency: int = 4
     default_language: str = "es"
     pipeline_timeout_seconds: int = 60
 
@@ -90,13 +98,19 @@ def get_settings_dict(settings: Settings | None = None) -> Dict[str, Any]:
         "llm_timeout": settings.llm_request_timeout_seconds,
         "llm_retries": settings.llm_retries,
         "llm_max_tokens": settings.llm_max_tokens,
+        "llm_cache_dir": settings.llm_cache_dir,
         "classification_temperature": settings.classification_temperature,
         "simplification_temperature": settings.simplification_temperature,
         "guide_temperature": settings.guide_temperature,
         "safety_temperature": settings.safety_temperature,
         "classification_rule_threshold": settings.classification_rule_threshold,
         "classification_force_llm_threshold": settings.classification_force_llm_threshold,
+        "llm_local_model_path": settings.llm_local_model_path,
+        "llm_local_classification_model_path": settings.llm_local_classification_model_path,
+        "llm_local_n_ctx": settings.llm_local_n_ctx,
+        "llm_local_n_gpu_layers": settings.llm_local_n_gpu_layers,
         "ocr_provider": settings.ocr_provider,
+        "ocr_max_concurrency": settings.ocr_max_concurrency,
         "default_language": settings.default_language,
         "pipeline_timeout_seconds": settings.pipeline_timeout_seconds,
         # Enable tolerant JSON parsing to handle fenced or decorated provider outputs.
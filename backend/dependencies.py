@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import logging
+import threading
+from typing import Any, Callable, Dict, Tuple, TypeVar
 
 from fastapi import Depends
 
 from . import config
-from .clients import llm_client, ocr_client
+from .clients import llm_client, local_llama_client, ocr_client
 from .services import (
     classification_service,
     ingest_service,
@@ -19,6 +21,30 @@ from .services import (
 Settings = config.Settings
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Clients and services keep state that only pays off across requests (LLM
+# model handles, result caches), so providers hand out one instance per
+# process and set of dependencies instead of building one per request.
+_SHARED: Dict[Tuple[Any, ...], Tuple[Tuple[Any, ...], Any]] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def _shared(name: str, factory: Callable[[], T], *deps: Any) -> T:
+    """Return the instance ``factory`` builds for ``name`` and ``deps``, built once.
+
+    Dependencies are matched by identity (Settings and the providers below
+    are themselves shared) and kept alive with the instance so their ids are
+    never reused by other objects.
+    """
+    key = (name, *map(id, deps))
+    with _SHARED_LOCK:
+        entry = _SHARED.get(key)
+        if entry is None:
+            entry = (deps, factory())
+            _SHARED[key] = entry
+    return entry[1]
+
 
 def get_settings() -> Settings:
     """Expose cached Settings instance for FastAPI."""
@@ -28,13 +54,26 @@ def get_settings() -> Settings:
 def get_llm_client(
     settings: Settings = Depends(get_settings),
 ) -> llm_client.BaseLLMClient:
-    """Instantiate the configured LLM client implementation."""
+    """Provide the configured LLM client implementation (one per Settings)."""
+    return _shared("llm_client", lambda: _build_llm_client(settings), settings)
+
+
+def _build_llm_client(settings: Settings) -> llm_client.BaseLLMClient:
     provider = settings.llm_provider.lower()
     llm_settings = config.get_settings_dict(settings)
     resolved_key = settings.resolved_llm_api_key
 
+    if provider == "local":
+        return local_llama_client.LocalLlamaCppClient(settings=llm_settings)
+
     if provider == "deepseek":
         if not resolved_key or resolved_key == llm_client.PLACEHOLDER_API_KEY:
+            if settings.llm_local_model_path:
+                logger.warning(
+                    "No DeepSeek API key configured; falling back to local model %s",
+                    settings.llm_local_model_path,
+                )
+                return local_llama_client.LocalLlamaCppClient(settings=llm_settings)
             raise RuntimeError(
                 "DeepSeek provider selected but no LLM_API_KEY/DEEPSEEK_API_KEY was provided. "
                 "Set the environment variable before starting the backend."
@@ -43,25 +82,36 @@ def get_llm_client(
 
     raise ValueError(
         f"Unsupported LLM provider '{settings.llm_provider}'. "
-        "Set LLM_PROVIDER=deepseek (default) to use the DeepSeek integration."
+        "Set LLM_PROVIDER=deepseek (default) to use the DeepSeek integration "
+        "or LLM_PROVIDER=local to run a GGUF model through llama.cpp."
     )
 
 
 def get_ocr_service(
     settings: Settings = Depends(get_settings),
 ) -> ocr_client.OCRService:
-    """Instantiate the OCR service wrapper."""
-    return ocr_client.OCRService(provider=settings.ocr_provider)
+    """Provide the shared OCR service wrapper."""
+    return _shared("ocr_service", lambda: ocr_client.OCRService(provider=settings.ocr_provider), settings)
 
 
 def get_ingest_service(
     settings: Settings = Depends(get_settings),
     ocr_service: ocr_client.OCRService = Depends(get_ocr_service),
 ) -> ingest_service.IngestService:
-    """Provide IngestService with OCR dependency."""
-    return ingest_service.IngestService(
-        ocr=ocr_service,
-        default_language=settings.default_language,
+    """Provide the shared IngestService with OCR dependency.
+
+    Sharing it keeps the OCR result cache and the OCR rate limiter alive
+    across uploads.
+    """
+    return _shared(
+        "ingest_service",
+        lambda: ingest_service.IngestService(
+            ocr=ocr_service,
+            default_language=settings.default_language,
+            max_concurrency=settings.ocr_max_concurrency,
+        ),
+        settings,
+        ocr_service,
     )
 
 
@@ -74,30 +124,51 @@ def get_classification_service(
     settings: Settings = Depends(get_settings),
     llm_client_instance: llm_client.BaseLLMClient = Depends(get_llm_client),
 ) -> classification_service.ClassificationService:
-    """Provide ClassificationService with configured thresholds."""
-    return classification_service.ClassificationService(
-        client=llm_client_instance,
-        rule_threshold=settings.classification_rule_threshold,
-        force_llm_threshold=settings.classification_force_llm_threshold,
+    """Provide the shared ClassificationService with configured thresholds."""
+    return _shared(
+        "classification_service",
+        lambda: classification_service.ClassificationService(
+            client=llm_client_instance,
+            rule_threshold=settings.classification_rule_threshold,
+            force_llm_threshold=settings.classification_force_llm_threshold,
+        ),
+        settings,
+        llm_client_instance,
     )
 
 
 def get_simplification_service(
     llm_client_instance: llm_client.BaseLLMClient = Depends(get_llm_client),
 ) -> simplification_service.SimplificationService:
-    """Provide SimplificationService with the pluggable LLM."""
-    return simplification_service.SimplificationService(client=llm_client_instance)
+    """Provide the shared SimplificationService with the pluggable LLM.
+
+    Sharing it lets concurrent requests for the same document merge their
+    in-flight LLM calls and reuse the payload cache.
+    """
+    return _shared(
+        "simplification_service",
+        lambda: simplification_service.SimplificationService(client=llm_client_instance),
+        llm_client_instance,
+    )
 
 
 def get_legal_guide_service(
     llm_client_instance: llm_client.BaseLLMClient = Depends(get_llm_client),
 ) -> legal_guide_service.LegalGuideService:
-    """Provide LegalGuideService."""
-    return legal_guide_service.LegalGuideService(client=llm_client_instance)
+    """Provide the shared LegalGuideService."""
+    return _shared(
+        "legal_guide_service",
+        lambda: legal_guide_service.LegalGuideService(client=llm_client_instance),
+        llm_client_instance,
+    )
 
 
 def get_safety_check_service(
     llm_client_instance: llm_client.BaseLLMClient = Depends(get_llm_client),
 ) -> safety_check_service.SafetyCheckService:
-    """Provide SafetyCheckService."""
-    return safety_check_service.SafetyCheckService(client=llm_client_instance)
+    """Provide the shared SafetyCheckService (its verifier cache outlives requests)."""
+    return _shared(
+        "safety_check_service",
+        lambda: safety_check_service.SafetyCheckService(client=llm_client_instance),
+        llm_client_instance,
+    )
@@ -24,12 +24,14 @@ def system_prompt() -> str:
 
 def user_prompt(text_snippet: str, sections: List[str] | None = None) -> str:
     sections_block = "\n".join(f"- {s}" for s in (sections or [])) or "- (sin secciones detectadas)"
+    # Constant instructions and output format before the document so the
+    # prompt prefix is identical across documents.
     return (
-        f"Analiza el siguiente texto y clasifícalo:\n\n"
+        "Analiza el texto del documento y clasifícalo.\n"
+        "Devuelve SOLO un JSON con esta forma:\n"
+        "{\n  \"doc_type\": \"...\",\n  \"doc_subtype\": \"...\",\n  \"confidence\": 0.0\n}\n\n"
         f"--- DOCUMENTO ---\n"
         f"{text_snippet}\n"
         f"--- FIN DOCUMENTO ---\n\n"
-        f"Secciones detectadas:\n{sections_block}\n\n"
-        "Devuelve SOLO un JSON con esta forma:\n"
-        "{\n  \"doc_type\": \"...\",\n  \"doc_subtype\": \"...\",\n  \"confidence\": 0.0\n}\n"
+        f"Secciones detectadas:\n{sections_block}\n"
     )
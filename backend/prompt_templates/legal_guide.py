@@ -1,6 +1,6 @@
 """Prompt templates for legal guide generation with decisionFallo context."""
 from __future__ import annotations
-from typing import Dict
+from typing import Dict, Sequence, Tuple
 
 
 def system_prompt() -> str:
@@ -15,7 +15,39 @@ def system_prompt() -> str:
     )
 
 
-def user_prompt(
+# The reminders and output format are the same for every request, so they
+# precede the per-document blocks and stay in the provider's cached prefix.
+_USER_INSTRUCTIONS = (
+    "Genera la guia legal a partir de la simplificacion y el fallo.\n"
+    "Recuerda: usa condicionales si whoWins no es desconocido. Si whoWins es desconocido, indica que no se puede saber quien gano y mantente neutro.\n"
+    "Prohibido inventar efectos o plazos no presentes en falloLiteral. Devuelve solo JSON:\n"
+    "{\n"
+    '  "meaning_for_you": "...",\n'
+    '  "what_to_do_now": "...",\n'
+    '  "what_happens_next": "...",\n'
+    '  "deadlines_and_risks": "..."\n'
+    "}\n\n"
+)
+
+_BATCH_INSTRUCTIONS = (
+    "Genera una guia legal independiente para cada uno de los documentos siguientes.\n"
+    "Recuerda: usa condicionales si whoWins no es desconocido. Si whoWins es desconocido, indica que no se puede saber quien gano y mantente neutro.\n"
+    "Prohibido inventar efectos o plazos no presentes en falloLiteral. No mezcles informacion entre documentos.\n"
+    "Devuelve solo JSON con una guia por documento, en el mismo orden que los documentos:\n"
+    "{\n"
+    '  "guides": [\n'
+    "    {\n"
+    '      "meaning_for_you": "...",\n'
+    '      "what_to_do_now": "...",\n'
+    '      "what_happens_next": "...",\n'
+    '      "deadlines_and_risks": "..."\n'
+    "    }\n"
+    "  ]\n"
+    "}\n\n"
+)
+
+
+def _input_block(
     simplified_text: str,
     context: Dict[str, str],
     decision_fallo: Dict[str, str],
@@ -25,7 +57,6 @@ def user_prompt(
     dec_lines = "\n".join(f"{k}: {v}" for k, v in decision_fallo.items())
     meta_lines = "\n".join(f"{k}: {v}" for k, v in metadata.items())
     return (
-        "Genera la guia legal a partir de la simplificacion y el fallo.\n\n"
         "--- CONTEXTO DOCUMENTO ---\n"
         f"{ctx_lines}\n"
         "--- METADATOS ---\n"
@@ -35,12 +66,29 @@ def user_prompt(
         "--- TEXTO SIMPLIFICADO ---\n"
         f"{simplified_text}\n"
         "--- FIN ---\n\n"
-        "Recuerda: usa condicionales si whoWins no es desconocido. Si whoWins es desconocido, indica que no se puede saber quien gano y mantente neutro.\n"
-        "Prohibido inventar efectos o plazos no presentes en falloLiteral. Devuelve solo JSON:\n"
-        "{\n"
-        '  "meaning_for_you": "...",\n'
-        '  "what_to_do_now": "...",\n'
-        '  "what_happens_next": "...",\n'
-        '  "deadlines_and_risks": "..."\n'
-        "}\n"
+    )
+
+
+def user_prompt(
+    simplified_text: str,
+    context: Dict[str, str],
+    decision_fallo: Dict[str, str],
+    metadata: Dict[str, str],
+) -> str:
+    return _USER_INSTRUCTIONS + _input_block(simplified_text, context, decision_fallo, metadata)
+
+
+def batch_user_prompt(
+    items: Sequence[Tuple[str, Dict[str, str], Dict[str, str], Dict[str, str]]],
+) -> str:
+    """Pack several guide requests (simplified text, context, decision, metadata) into one prompt."""
+    blocks = "".join(
+        f"=== DOCUMENTO {index} ===\n" + _input_block(*item)
+        for index, item in enumerate(items, start=1)
+    )
+    # The document count varies per batch, so it follows the static prefix.
+    return (
+        _BATCH_INSTRUCTIONS
+        + f"Hay {len(items)} documentos; devuelve exactamente {len(items)} guias.\n\n"
+        + blocks
     )
@@ -1,7 +1,13 @@
-"""Prompt templates for structured simplification with falloLiteral mapping."""
+"""Prompt templates for structured simplification with falloLiteral mapping.
+
+Ordering rule: constant text (instructions, output schema) goes before any
+per-document field. Providers with automatic prefix caching only reuse the
+prompt up to the first differing token, so a variable field placed early
+makes everything after it uncacheable.
+"""
 from __future__ import annotations
 
-from typing import Optional, Dict
+from typing import Dict, Optional, Sequence, Tuple
 
 
 def system_prompt() -> str:
@@ -26,8 +32,36 @@ def system_prompt() -> str:
     )
 
 
-def user_prompt(
-    text: str,
+_USER_INSTRUCTIONS = (
+    "Devuelve SOLO el JSON con la estructura indicada. No menciones texto truncado ni agregues comentarios.\n\n"
+)
+
+
+# Per-document context, filled with str.format; every other part of the
+# prompt is constant text.
+_CONTEXT_TEMPLATE = (
+    "Tipo de documento: {doc_type} / {doc_subtype}\n"
+    "Juzgado: {courtName}\n"
+    "Ciudad: {city}\n"
+    "Fecha: {decisionDate}\n"
+    "Numero de caso: {caseNumber}\n"
+    "Numero de resolucion: {resolutionNumber}\n"
+    "Tipo de procedimiento: {procedureType}\n"
+    "Juez/Jueza: {judgeName}\n\n"
+    "Demandante: {plaintiffName}\n"
+    "Representantes Demandante: {plaintiffRepresentatives}\n"
+    "Demandado: {defendantName}\n"
+    "Representantes Demandado: {defendantRepresentatives}\n\n"
+    "--- FALLO_LITERAL ---\n"
+    "{fallo_literal}\n"
+    "--- FIN FALLO_LITERAL ---\n\n"
+    "Resultado y costas deben salir unicamente de este bloque falloLiteral. Prohibido usar otras secciones.\n\n"
+)
+_TEXT_HEAD = "--- TEXTO ORIGINAL ---\n"
+_TEXT_TAIL = "\n--- FIN TEXTO ---\n"
+
+
+def _context_block(
     doc_type: Optional[str] = None,
     doc_subtype: Optional[str] = None,
     fallo_literal: Optional[str] = None,
@@ -36,36 +70,66 @@ def user_prompt(
 ) -> str:
     metadata = metadata or {}
     parties = parties or {}
-    header = (
-        f"Tipo de documento: {doc_type or 'DESCONOCIDO'} / {doc_subtype or 'DESCONOCIDO'}\n"
-        f"Juzgado: {metadata.get('courtName','')}\n"
-        f"Ciudad: {metadata.get('city','')}\n"
-        f"Fecha: {metadata.get('decisionDate','')}\n"
-        f"Numero de caso: {metadata.get('caseNumber','')}\n"
-        f"Numero de resolucion: {metadata.get('resolutionNumber','')}\n"
-        f"Tipo de procedimiento: {metadata.get('procedureType','')}\n"
-        f"Juez/Jueza: {metadata.get('judgeName','')}\n\n"
-    )
-    parties_block = (
-        f"Demandante: {parties.get('plaintiffName','')}\n"
-        f"Representantes Demandante: {parties.get('plaintiffRepresentatives','')}\n"
-        f"Demandado: {parties.get('defendantName','')}\n"
-        f"Representantes Demandado: {parties.get('defendantRepresentatives','')}\n\n"
+    return _CONTEXT_TEMPLATE.format(
+        doc_type=doc_type or "DESCONOCIDO",
+        doc_subtype=doc_subtype or "DESCONOCIDO",
+        courtName=metadata.get("courtName", ""),
+        city=metadata.get("city", ""),
+        decisionDate=metadata.get("decisionDate", ""),
+        caseNumber=metadata.get("caseNumber", ""),
+        resolutionNumber=metadata.get("resolutionNumber", ""),
+        procedureType=metadata.get("procedureType", ""),
+        judgeName=metadata.get("judgeName", ""),
+        plaintiffName=parties.get("plaintiffName", ""),
+        plaintiffRepresentatives=parties.get("plaintiffRepresentatives", ""),
+        defendantName=parties.get("defendantName", ""),
+        defendantRepresentatives=parties.get("defendantRepresentatives", ""),
+        fallo_literal=fallo_literal or "",
     )
 
-    fallo_block = (
-        "--- FALLO_LITERAL ---\n"
-        f"{fallo_literal or ''}\n"
-        "--- FIN FALLO_LITERAL ---\n\n"
-        "Resultado y costas deben salir unicamente de este bloque falloLiteral. Prohibido usar otras secciones.\n\n"
+
+def user_prompt(
+    text: str,
+    doc_type: Optional[str] = None,
+    doc_subtype: Optional[str] = None,
+    fallo_literal: Optional[str] = None,
+    metadata: Optional[Dict[str, str]] = None,
+    parties: Optional[Dict[str, str]] = None,
+) -> str:
+    # Static instructions first and per-document data last, so consecutive
+    # requests share a byte-identical prefix (system prompt plus this line)
+    # that providers with automatic prefix caching can reuse. One join copies
+    # the (up to 16k character) document text once.
+    return "".join(
+        (
+            _USER_INSTRUCTIONS,
+            _context_block(doc_type, doc_subtype, fallo_literal, metadata, parties),
+            _TEXT_HEAD,
+            text,
+            _TEXT_TAIL,
+        )
     )
 
+
+def batch_user_prompt(
+    items: Sequence[Tuple[str, str, str, Optional[str], Dict[str, str], Dict[str, str]]],
+) -> str:
+    """Pack several (text, doc_type, doc_subtype, fallo_literal, metadata, parties) into one prompt."""
+    blocks = "".join(
+        f"=== DOCUMENTO {index} ===\n"
+        + _context_block(doc_type, doc_subtype, fallo_literal, metadata, parties)
+        + _TEXT_HEAD
+        + text
+        + _TEXT_TAIL
+        + "\n"
+        for index, (text, doc_type, doc_subtype, fallo_literal, metadata, parties) in enumerate(items, start=1)
+    )
     return (
-        header
-        + parties_block
-        + fallo_block
-        + "Devuelve SOLO el JSON con la estructura indicada. No menciones texto truncado ni agregues comentarios.\n"
-        "--- TEXTO ORIGINAL ---\n"
-        f"{text}\n"
-        "--- FIN TEXTO ---\n"
+        f"Simplifica por separado cada uno de los {len(items)} documentos siguientes. "
+        "Cada resultado solo puede usar el falloLiteral de su propio documento.\n\n"
+        + blocks
+        + "No mezcles informacion entre documentos. No menciones texto truncado ni agregues comentarios.\n"
+        f"Devuelve SOLO un JSON con exactamente {len(items)} elementos, en el mismo orden que los documentos, "
+        "cada uno con la estructura indicada:\n"
+        '{"documents": [ ... ]}\n'
     )
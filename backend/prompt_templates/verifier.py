@@ -1,7 +1,7 @@
 """Prompt templates for safety verifier."""
 from __future__ import annotations
 
-from typing import Dict
+from typing import Any, Dict, Sequence, Tuple
 
 
 def system_prompt() -> str:
@@ -16,10 +16,32 @@ def system_prompt() -> str:
     )
 
 
-def user_prompt(original: str, simplified: str, guide: Dict[str, str]) -> str:
+def _input_block(original: str, simplified: str, guide: Dict[str, str]) -> str:
     return (
         f"TEXTO ORIGINAL:\n--- ORIGINAL ---\n{original}\n--- FIN ORIGINAL ---\n\n"
         f"TEXTO SIMPLIFICADO:\n--- SIMPLIFICADO ---\n{simplified}\n--- FIN SIMPLIFICADO ---\n\n"
         f"GUIA PARA EL CIUDADANO:\n--- GUIA ---\n{guide}\n--- FIN GUIA ---\n\n"
-        "Devuelve SOLO un JSON con esta forma:\n{\n  \"is_safe\": true,\n  \"warnings\": [\"...\"]\n}\n"
+    )
+
+
+def user_prompt(original: str, simplified: str, guide: Dict[str, str]) -> str:
+    # Output format first, texts last (see the simplification prompt module).
+    return (
+        "Devuelve SOLO un JSON con esta forma:\n{\n  \"is_safe\": true,\n  \"warnings\": [\"...\"]\n}\n\n"
+        + _input_block(original, simplified, guide)
+    )
+
+
+def batch_user_prompt(items: Sequence[Tuple[str, str, Any]]) -> str:
+    """Pack several (original, simplified, guide) triples into one prompt."""
+    blocks = "".join(
+        f"=== DOCUMENTO {index} ===\n" + _input_block(*item)
+        for index, item in enumerate(items, start=1)
+    )
+    return (
+        f"Revisa por separado cada uno de los {len(items)} documentos siguientes.\n\n"
+        + blocks
+        + "No mezcles informacion entre documentos.\n"
+        f"Devuelve SOLO un JSON con exactamente {len(items)} resultados, en el mismo orden que los documentos:\n"
+        "{\n  \"results\": [\n    {\n      \"is_safe\": true,\n      \"warnings\": [\"...\"]\n    }\n  ]\n}\n"
     )
@@ -1,17 +1,17 @@
 """Shared DTOs and schema definitions for the backend pipeline."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class DocumentInput(BaseModel):
     """Input payload expected by POST /process_document."""
 
     sourceType: str = Field(..., description="text | pdf | image")
-    fileContent: Optional[str] = Field(
-        default=None, description="Placeholder for binary payload or base64 buffer."
+    fileContent: Optional[Union[str, bytes]] = Field(
+        default=None, description="Base64 buffer (JSON) or raw file bytes (multipart uploads)."
     )
     plainText: Optional[str] = Field(
         default=None, description="Populated when the citizen pastes text directly."
@@ -52,6 +52,26 @@ class SegmentedDocument(BaseModel):
     normalizedText: str
     sections: List[DocumentSection] = Field(default_factory=list)
     metadata: Optional[DocumentMetadata] = None
+    falloLiteral: Optional[str] = Field(
+        default=None, description="Literal FALLO block detected during normalization."
+    )
+    # (normalizedText, its upper-cased copy); see upper_text().
+    _upper_cache: Optional[Tuple[str, str]] = PrivateAttr(default=None)
+
+    @property
+    def extra_meta(self) -> Dict[str, str]:
+        """metadata.extra, or an empty dict when the document has no metadata."""
+        return self.metadata.extra if self.metadata is not None else {}
+
+    def upper_text(self) -> str:
+        """Upper-cased normalizedText, computed once and shared by the services."""
+        text = self.normalizedText or ""
+        cached = self._upper_cache
+        # Identity check: recompute if normalizedText was reassigned.
+        if cached is None or cached[0] is not text:
+            cached = (text, text.upper())
+            self._upper_cache = cached
+        return cached[1]
 
 
 class ClassificationResult(BaseModel):
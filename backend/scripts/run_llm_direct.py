@@ -4,9 +4,12 @@ Use this when dependencies.get_llm_client does not pick up the env key.
 
 Usage (PowerShell):
   $env:DEEPSEEK_API_KEY = '<key>'; python backend/scripts/run_llm_direct.py
+
+Set LLM_DEBUG_RAW=1 to print the raw LLM payloads of each stage.
 """
 from __future__ import annotations
 
+import io
 import json
 import os
 import sys
@@ -34,10 +37,12 @@ def extract_text_from_pdf(path: str) -> str:
     from pypdf import PdfReader
 
     reader = PdfReader(path)
-    parts = []
-    for p in reader.pages:
-        parts.append(p.extract_text() or "")
-    return "\n\n".join(parts)
+    buf = io.StringIO()
+    for index, p in enumerate(reader.pages):
+        if index:
+            buf.write("\n\n")
+        buf.write(p.extract_text() or "")
+    return buf.getvalue()
 
 
 def main():
@@ -94,12 +99,24 @@ def main():
     b64 = base64.b64encode(pdf_bytes).decode("utf-8")
     doc_input = schemas.DocumentInput(sourceType="pdf", fileContent=b64)
 
+    # Hook into the services' own LLM calls instead of issuing extra debug requests.
+    debug_raw = os.environ.get("LLM_DEBUG_RAW") == "1"
+
+    def raw_printer(stage: str):
+        if not debug_raw:
+            return None
+        return lambda raw: print(f"DEBUG raw {stage} payload:", raw)
+
     try:
         ingest_result = ingest_service.ingest(doc_input)
         normalized = normalization_service.normalize(ingest_result)
-        classification = classification_service.classify(normalized)
-        simplification = simplification_service.simplify(normalized, classification)
-        legal_guide = legal_guide_service.build_guide(normalized, classification, simplification)
+        classification = classification_service.classify(normalized, on_raw=raw_printer("classification"))
+        simplification = simplification_service.simplify(
+            normalized, classification, on_raw=raw_printer("simplification")
+        )
+        legal_guide = legal_guide_service.build_guide(
+            normalized, classification, simplification, on_raw=raw_printer("guide")
+        )
         safety = safety_check_service.evaluate(normalized, simplification, legal_guide)
     except Exception as e:
         print("Pipeline execution failed:", e)
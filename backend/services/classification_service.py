@@ -1,11 +1,12 @@
 """Hybrid classification service for legal documents."""
 from __future__ import annotations
 
-from typing import List, Sequence
+from typing import Callable, Dict, List, Sequence, Tuple
 
 from .. import schemas
 from ..clients.llm_client import BaseLLMClient, LLMClientError
 from ..prompt_templates import classification as classification_prompt
+from ..utils.content_cache import LRUCache, cache_enabled_from_env, content_key
 import json
 import re
 
@@ -36,6 +37,15 @@ SUBTYPE_KEYWORDS = {
     "RECURSO": ["RECURSO", "RECURR"],
 }
 
+# Flattened views of the keyword tables, built once at import. Keywords shared
+# by several groups (e.g. SENTENCIA) are searched in the document only once.
+_TYPE_TABLE = tuple((doc_type, tuple(keywords)) for doc_type, keywords in TYPE_KEYWORDS.items())
+_SUBTYPE_TABLE = tuple((subtype, tuple(keywords)) for subtype, keywords in SUBTYPE_KEYWORDS.items())
+_ALL_KEYWORDS = tuple(
+    dict.fromkeys(kw for _, keywords in _TYPE_TABLE + _SUBTYPE_TABLE for kw in keywords)
+)
+_SUBTYPE_KEYWORDS_FLAT = tuple(dict.fromkeys(kw for _, keywords in _SUBTYPE_TABLE for kw in keywords))
+
 
 class ClassificationService:
     """Combine rule-based heuristics with a pluggable LLM/ML classifier."""
@@ -45,22 +55,65 @@ class ClassificationService:
         client: BaseLLMClient,
         rule_threshold: float,
         force_llm_threshold: float,
+        cache_enabled: bool | None = None,
+        cache_size: int = 256,
     ):
         self._client = client
         self._rule_threshold = rule_threshold
         self._force_llm_threshold = force_llm_threshold
+        if cache_enabled is None:
+            cache_enabled = cache_enabled_from_env()
+        self._cache_enabled = cache_enabled
+        # Results keyed by a digest of normalizedText; repeated documents skip
+        # both the rule pass and the LLM fallback. Only long-lived instances
+        # benefit (the API shares one through dependencies.py). Entries are
+        # private copies, so callers mutating a result cannot alter later hits.
+        self._cache: LRUCache[schemas.ClassificationResult] = LRUCache(cache_size)
+
+    def classify(
+        self,
+        document: schemas.SegmentedDocument,
+        on_raw: Callable[[str], None] | None = None,
+    ) -> schemas.ClassificationResult:
+        """Return ClassificationResult prioritizing deterministic rules.
+
+        ``on_raw`` receives the raw LLM payload (before JSON parsing) whenever
+        the LLM fallback runs, so debug runners can log it without issuing a
+        second request.
+        """
+        if not self._cache_enabled:
+            return self._classify(document, on_raw)[0]
+
+        key = content_key(document.normalizedText, *(section.name for section in document.sections))
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        result, cacheable = self._classify(document, on_raw)
+        if cacheable:
+            self._cache.put(key, result.model_copy(deep=True))
+        return result
 
-    def classify(self, document: schemas.SegmentedDocument) -> schemas.ClassificationResult:
-        """Return ClassificationResult prioritizing deterministic rules."""
+    def _classify(
+        self,
+        document: schemas.SegmentedDocument,
+        on_raw: Callable[[str], None] | None = None,
+    ) -> Tuple[schemas.ClassificationResult, bool]:
+        """Return the result and whether it may be cached.
+
+        A rules-only fallback after a failed LLM call is not cacheable: the
+        failure may be transient and the next request should retry the LLM.
+        """
         rule_result = self._rule_based_classification(document)
         if rule_result.confidence >= self._rule_threshold:
-            return rule_result
+            return rule_result, True
+
+        if rule_result.confidence >= self._force_llm_threshold:
+            return rule_result, True
 
-        llm_result = None
-        if rule_result.confidence < self._force_llm_threshold:
-            llm_result = self._llm_classification(document, rule_result)
+        llm_result = self._llm_classification(document, rule_result, on_raw)
         if llm_result is None:
-            return rule_result
+            return rule_result, False
 
         if llm_result.confidence > rule_result.confidence:
             combined_explanations = rule_result.explanations + llm_result.explanations
@@ -70,9 +123,9 @@ class ClassificationService:
                 confidence=llm_result.confidence,
                 source="HYBRID",
                 explanations=combined_explanations,
-            )
+            ), True
 
-        return rule_result
+        return rule_result, True
 
     # ------------------------------------------------------------------
     # Rules
@@ -81,7 +134,7 @@ class ClassificationService:
         self,
         document: schemas.SegmentedDocument,
     ) -> schemas.ClassificationResult:
-        text = (document.normalizedText or "").upper()
+        text = document.upper_text()
         sections = [section.name.upper() for section in document.sections]
 
         # Inspect header (first few lines) for strong subtype indicators
@@ -99,12 +152,18 @@ class ClassificationService:
         elif re.search(r"\bPROVIDENCIA\b", header_text):
             forced_subtype = "PROVIDENCIA"
 
+        # One substring scan per distinct keyword; the scoring loops below only
+        # do set lookups.
+        section_set = set(sections)
+        in_text = {kw for kw in _ALL_KEYWORDS if kw in text}
+        in_header = {kw for kw in _SUBTYPE_KEYWORDS_FLAT if kw in header_text}
+
         type_scores = {key: 0.0 for key in TYPE_KEYWORDS}
         type_matches: List[str] = []
 
-        for doc_type, keywords in TYPE_KEYWORDS.items():
+        for doc_type, keywords in _TYPE_TABLE:
             for kw in keywords:
-                if kw in text or kw in sections:
+                if kw in in_text or kw in section_set:
                     type_scores[doc_type] += 0.2
                     type_matches.append(f"{doc_type}:{kw}")
 
@@ -113,13 +172,13 @@ class ClassificationService:
 
         subtype_scores = {key: 0.0 for key in SUBTYPE_KEYWORDS}
         subtype_matches: List[str] = []
-        for subtype, keywords in SUBTYPE_KEYWORDS.items():
+        for subtype, keywords in _SUBTYPE_TABLE:
             for kw in keywords:
                 # Strong signal if keyword appears in the document header
-                if kw in header_text:
+                if kw in in_header:
                     subtype_scores[subtype] += 1.0
                     subtype_matches.append(f"{subtype}:{kw}(header)")
-                elif kw in text:
+                elif kw in in_text:
                     subtype_scores[subtype] += 0.25
                     subtype_matches.append(f"{subtype}:{kw}")
 
@@ -161,13 +220,15 @@ class ClassificationService:
         self,
         document: schemas.SegmentedDocument,
         rule_result: schemas.ClassificationResult,
+        on_raw: Callable[[str], None] | None = None,
     ) -> schemas.ClassificationResult | None:
         section_names: Sequence[str] | None = [section.name for section in document.sections]
         try:
             # Backwards-compatible: if the client implements a high-level
             # `classify` method, prefer that (used by test fakes). Otherwise
-            # fall back to the chat-based prompt flow.
-            if hasattr(self._client, "classify") and callable(getattr(self._client, "classify")):
+            # fall back to the chat-based prompt flow. Callers asking for the
+            # raw payload go through chat so there is a payload to report.
+            if on_raw is None and hasattr(self._client, "classify") and callable(getattr(self._client, "classify")):
                 try:
                     result = self._client.classify(document.normalizedText[:6000], section_names)
                     # If the client returned a ClassificationResult, return it.
@@ -177,15 +238,9 @@ class ClassificationService:
                     data = result
                 except Exception:
                     # fall back to chat-based flow below
-                        system = classification_prompt.system_prompt()
-                        user = classification_prompt.user_prompt(document.normalizedText[:6000], section_names)
-                        raw = self._client.chat(system, user, temperature=0.0)
-                        data = self._client._parse_json(raw)
+                    data = self._chat_classification(document, section_names)
             else:
-                system = classification_prompt.system_prompt()
-                user = classification_prompt.user_prompt(document.normalizedText[:6000], section_names)
-                raw = self._client.chat(system, user, temperature=0.0)
-                data = self._client._parse_json(raw)
+                data = self._chat_classification(document, section_names, on_raw)
         except (LLMClientError, json.JSONDecodeError, Exception):
             return None
 
@@ -203,3 +258,16 @@ class ClassificationService:
             source="LLM",
             explanations=[data.get("rationale") or data.get("reasoning") or ""],
         )
+
+    def _chat_classification(
+        self,
+        document: schemas.SegmentedDocument,
+        section_names: Sequence[str] | None,
+        on_raw: Callable[[str], None] | None = None,
+    ) -> Dict:
+        system = classification_prompt.system_prompt()
+        user = classification_prompt.user_prompt(document.normalizedText[:6000], section_names)
+        raw = self._client.chat(system, user, temperature=0.0)
+        if on_raw is not None:
+            on_raw(raw)
+        return self._client._parse_json(raw)
@@ -1,19 +1,80 @@
 """Document ingestion utilities for Justice Made Clear."""
 from __future__ import annotations
 
+import asyncio
 import base64
-from typing import Optional
+import binascii
+import hashlib
+import mmap
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar, Union
 
 from .. import schemas
 from ..clients.ocr_client import OCRClientError, OCRService
+from ..utils.content_cache import LRUCache
+
+T = TypeVar("T")
+
+# Transient provider throttling errors: the HTTP status or the usual phrases.
+# Whole phrases only, so words like "generate" or "separate" do not count.
+RATE_LIMIT_RE = re.compile(
+    r"\b429\b|\brate[\s_-]?limit|\btoo many requests\b|\bquota\b", re.IGNORECASE
+)
+
+# File signatures recognised on raw (non-base64) uploads: PDF, PNG, JPEG,
+# TIFF (little/big endian) and GIF.
+BINARY_MAGIC = (b"%PDF-", b"\x89PNG", b"\xff\xd8\xff", b"II*\x00", b"MM\x00*", b"GIF8")
+# Signatures that short-circuit base64 decoding of str payloads; only those
+# containing a character outside the base64 alphabet qualify ("GIF8" is
+# valid base64, so it must go through the decoder).
+TEXT_MAGIC = ("%PDF-",)
+
+# Uploads above this size are spooled to disk and memory-mapped for OCR.
+LARGE_UPLOAD_BYTES = 8 * 1024 * 1024
+
+
+def _b64decode_strict(data: Union[str, bytes]) -> bytes:
+    """Decode base64 rejecting any character outside the alphabet.
+
+    Same acceptance as ``base64.b64decode(validate=True)`` but validated
+    inside binascii's C decoder instead of a separate regex pass.
+    """
+    return binascii.a2b_base64(data, strict_mode=True)
 
 
 class IngestService:
     """Handle ingestion from text, PDF, or image sources."""
 
-    def __init__(self, ocr: OCRService, default_language: str = "es"):
+    def __init__(
+        self,
+        ocr: OCRService,
+        default_language: str = "es",
+        max_concurrency: int = 4,
+        ocr_max_attempts: int = 3,
+        ocr_backoff_base: float = 1.0,
+        ocr_backoff_max: float = 8.0,
+        ocr_min_interval: float = 0.0,
+        ocr_cache_size: int = 256,
+        spool_threshold: int = LARGE_UPLOAD_BYTES,
+    ):
         self._ocr = ocr
         self._default_language = default_language
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._ocr_max_attempts = max(1, int(ocr_max_attempts))
+        self._ocr_backoff_base = ocr_backoff_base
+        self._ocr_backoff_max = ocr_backoff_max
+        # Minimum spacing between OCR calls (simple rate limiter); 0 disables it.
+        self._ocr_min_interval = ocr_min_interval
+        self._last_call_ts = 0.0
+        self._rate_lock = threading.Lock()
+        # OCR text keyed by (sha256 of the file, kind, language); re-ingesting
+        # the same upload skips the provider entirely. Only long-lived
+        # instances benefit (the API shares one through dependencies.py).
+        self._ocr_cache: LRUCache[str] = LRUCache(ocr_cache_size)
+        self._spool_threshold = spool_threshold
 
     def ingest(self, document_input: schemas.DocumentInput) -> schemas.IngestResult:
         """Public entry point that routes to the correct ingestion strategy."""
@@ -26,6 +87,23 @@ class IngestService:
             return self._from_image(document_input)
         raise ValueError(f"Unsupported sourceType '{document_input.sourceType}'.")
 
+    async def ingest_many(
+        self,
+        document_inputs: Sequence[schemas.DocumentInput],
+    ) -> List[schemas.IngestResult]:
+        """Ingest several documents with at most ``max_concurrency`` OCR calls in flight.
+
+        OCR providers block, so each document runs in a worker thread. Results
+        keep the input order; the first failure is raised.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def process(document_input: schemas.DocumentInput) -> schemas.IngestResult:
+            async with semaphore:
+                return await asyncio.to_thread(self.ingest, document_input)
+
+        return list(await asyncio.gather(*(process(doc) for doc in document_inputs)))
+
     # ------------------------------------------------------------------
     # TEXT INGESTION
     # ------------------------------------------------------------------
@@ -46,9 +124,12 @@ class IngestService:
     # PDF INGESTION
     # ------------------------------------------------------------------
     def _from_pdf(self, document_input: schemas.DocumentInput) -> schemas.IngestResult:
-        data_bytes = self._decode_file(document_input.fileContent)
         try:
-            text = self._ocr.extract_text_from_pdf(data_bytes, language=self._default_language)
+            # The decoded bytes are handed over without keeping a local
+            # reference so large uploads can be released once spooled.
+            text, size = self._cached_ocr(
+                "pdf", self._ocr.extract_text_from_pdf, self._decode_file(document_input.fileContent)
+            )
         except OCRClientError as exc:
             raise ValueError(f"OCR PDF extraction failed: {exc}") from exc
 
@@ -56,7 +137,7 @@ class IngestService:
             sourceType="pdf",
             language=self._default_language,
             charLength=len(text),
-            extra={"bytes": str(len(data_bytes))},
+            extra={"bytes": str(size)},
         )
         return schemas.IngestResult(rawText=text, metadata=metadata)
 
@@ -64,9 +145,10 @@ class IngestService:
     # IMAGE INGESTION
     # ------------------------------------------------------------------
     def _from_image(self, document_input: schemas.DocumentInput) -> schemas.IngestResult:
-        data_bytes = self._decode_file(document_input.fileContent)
         try:
-            text = self._ocr.extract_text_from_image(data_bytes, language=self._default_language)
+            text, size = self._cached_ocr(
+                "image", self._ocr.extract_text_from_image, self._decode_file(document_input.fileContent)
+            )
         except OCRClientError as exc:
             raise ValueError(f"OCR image extraction failed: {exc}") from exc
 
@@ -74,19 +156,85 @@ class IngestService:
             sourceType="image",
             language=self._default_language,
             charLength=len(text),
-            extra={"bytes": str(len(data_bytes))},
+            extra={"bytes": str(size)},
         )
         return schemas.IngestResult(rawText=text, metadata=metadata)
 
     # ------------------------------------------------------------------
     # HELPERS
     # ------------------------------------------------------------------
+    def _cached_ocr(self, kind: str, fn: Callable[..., str], data_bytes: bytes) -> Tuple[str, int]:
+        """Return (text, byte size), consulting the OCR cache first.
+
+        Files larger than ``spool_threshold`` are written to a temporary file
+        and handed to OCR as a read-only mmap, so the decoded bytes do not stay
+        on the heap for the duration of the OCR call.
+        """
+        size = len(data_bytes)
+        # hashlib delegates to OpenSSL, which uses the CPU's SHA extensions when present.
+        key = (hashlib.sha256(data_bytes).digest(), kind, self._default_language)
+        cached = self._ocr_cache.get(key)
+        if cached is not None:
+            return cached, size
+
+        if size <= self._spool_threshold:
+            text = self._with_retry(fn, data_bytes, language=self._default_language)
+        else:
+            with tempfile.TemporaryFile() as handle:
+                handle.write(data_bytes)
+                handle.flush()
+                del data_bytes
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    text = self._with_retry(fn, mapped, language=self._default_language)
+        self._ocr_cache.put(key, text)
+        return text, size
+
+    def _with_retry(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call an OCR function, retrying rate-limit errors with exponential backoff."""
+        attempt = 0
+        while True:
+            self._wait_for_rate_limit()
+            try:
+                return fn(*args, **kwargs)
+            except OCRClientError as exc:
+                attempt += 1
+                if attempt >= self._ocr_max_attempts or not self._is_rate_limited(exc):
+                    raise
+                time.sleep(min(self._ocr_backoff_max, self._ocr_backoff_base * 2 ** (attempt - 1)))
+
+    def _wait_for_rate_limit(self) -> None:
+        if self._ocr_min_interval <= 0:
+            return
+        with self._rate_lock:
+            wait = self._last_call_ts + self._ocr_min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_call_ts = time.monotonic()
+
+    @staticmethod
+    def _is_rate_limited(exc: Exception) -> bool:
+        return RATE_LIMIT_RE.search(str(exc)) is not None
+
     @staticmethod
-    def _decode_file(file_content: Optional[str]) -> bytes:
+    def _decode_file(file_content: Optional[Union[str, bytes]]) -> bytes:
         if not file_content:
             raise ValueError("fileContent is required for pdf/image ingestion.")
 
+        if isinstance(file_content, (bytes, bytearray, memoryview)):
+            data = bytes(file_content)
+            # Raw uploads are passed through untouched.
+            if data.startswith(BINARY_MAGIC):
+                return data
+            try:
+                return _b64decode_strict(data)
+            except (binascii.Error, ValueError):
+                return data
+
+        # A payload starting with "%PDF-" cannot be base64 ('%' is outside the
+        # alphabet), so skip the doomed decode attempt.
+        if file_content.startswith(TEXT_MAGIC):
+            return file_content.encode("utf-8", errors="ignore")
         try:
-            return base64.b64decode(file_content, validate=True)
-        except Exception:
+            return _b64decode_strict(file_content)
+        except (binascii.Error, ValueError):
             return file_content.encode("utf-8", errors="ignore")
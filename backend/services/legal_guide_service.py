@@ -1,53 +1,183 @@
 """Legal guide generation service using simplified text and optional decision hints."""
 from __future__ import annotations
 
-from typing import Any, Dict
+import json
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from .. import schemas
 from ..clients.llm_client import BaseLLMClient, LLMClientError
 from ..prompt_templates import legal_guide as legal_guide_prompt
+from ..utils.content_cache import LRUCache, cache_enabled_from_env, content_key
+
+# Generic advice used for blocks the LLM left empty and for the fallback guide.
+DEFAULT_MEANING = "Revisa la resolucion con ayuda profesional para entender sus efectos."
+DEFAULT_WHAT_TO_DO = "Consulta con tu abogado que obligaciones y derechos se derivan del fallo."
+DEFAULT_WHAT_NEXT = "Dependiendo del fallo, puede existir recurso; asesora sobre si conviene recurrir."
+DEFAULT_DEADLINES = "No se identifican plazos claros en el fallo; confirma posibles plazos legales generales."
+
+# Minimum number of uncached guides before build_guides_batch packs them into
+# a single LLM request.
+BATCH_MIN = 4
+
+# (item index, cache key, simplification, context, decision hints, metadata)
+_PendingGuide = Tuple[
+    int, Optional[bytes], schemas.SimplificationResult, Dict[str, Any], Dict[str, Any], Dict[str, str]
+]
+
+
+def _canonical_key(key: Any) -> str:
+    """Fold 'meaning_for_you' / 'meaningForYou' / 'meaning-for-you' to 'meaningforyou'."""
+    return str(key).replace("_", "").replace("-", "").lower()
 
 
 class LegalGuideService:
     """Create a four-block LegalGuide DTO from simplified content."""
 
-    def __init__(self, client: BaseLLMClient):
+    def __init__(self, client: BaseLLMClient, cache_enabled: bool | None = None, cache_size: int = 256):
         self._client = client
+        if cache_enabled is None:
+            cache_enabled = cache_enabled_from_env()
+        self._cache_enabled = cache_enabled
+        # Guides keyed by the exact prompt inputs; only long-lived instances
+        # benefit (the API shares one through dependencies.py). Entries are
+        # private copies handed out as copies.
+        self._cache: LRUCache[schemas.LegalGuide] = LRUCache(cache_size)
 
     def build_guide(
         self,
         document: schemas.SegmentedDocument,
         classification: schemas.ClassificationResult,
         simplification_result: schemas.SimplificationResult,
+        on_raw: Callable[[str], None] | None = None,
+        include_decision: bool = True,
     ) -> schemas.LegalGuide:
+        """Build the guide; ``on_raw`` receives the raw LLM payload before parsing.
+
+        With ``include_decision=False`` the FALLO hints from the simplification
+        are left out of the prompt and the guide relies on the text alone.
+        """
+        context, decision_dict, meta_dict = self._prompt_inputs(
+            document, classification, simplification_result, include_decision
+        )
+
+        key = self._cache_key(simplification_result, context, decision_dict, meta_dict)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached.model_copy(deep=True)
+
+        guide = self._generate(simplification_result, context, decision_dict, meta_dict, on_raw)
+        if guide is None:
+            return self._fallback(meta_dict)
+        if key is not None:
+            self._cache.put(key, guide.model_copy(deep=True))
+        return guide
+
+    def build_guides_batch(
+        self,
+        items: Sequence[
+            Tuple[schemas.SegmentedDocument, schemas.ClassificationResult, schemas.SimplificationResult]
+        ],
+    ) -> List[schemas.LegalGuide]:
+        """Build guides for several documents, packing them into one LLM call.
+
+        Batches smaller than ``BATCH_MIN`` (after cache hits) or clients without
+        a chat interface use one call per document; a malformed batch response
+        also falls back to per-document calls.
+        """
+        if len(items) < BATCH_MIN or not callable(getattr(self._client, "chat", None)):
+            return [self.build_guide(*item) for item in items]
+
+        results: List[schemas.LegalGuide | None] = [None] * len(items)
+        pending: List[_PendingGuide] = []
+        for index, (document, classification, simplification_result) in enumerate(items):
+            context, decision_dict, meta_dict = self._prompt_inputs(
+                document, classification, simplification_result, True
+            )
+            key = self._cache_key(simplification_result, context, decision_dict, meta_dict)
+            cached = self._cache.get(key) if key is not None else None
+            if cached is not None:
+                results[index] = cached.model_copy(deep=True)
+            else:
+                pending.append((index, key, simplification_result, context, decision_dict, meta_dict))
+
+        guides: List[schemas.LegalGuide | None] | None = None
+        if len(pending) >= BATCH_MIN:
+            guides = self._generate_batch(pending)
+        if guides is None:
+            guides = [
+                self._generate(simplification_result, context, decision_dict, meta_dict)
+                for _, _, simplification_result, context, decision_dict, meta_dict in pending
+            ]
+
+        for (index, key, _, _, _, meta_dict), guide in zip(pending, guides):
+            if guide is None:
+                results[index] = self._fallback(meta_dict)
+                continue
+            if key is not None:
+                self._cache.put(key, guide.model_copy(deep=True))
+            results[index] = guide
+        return results  # type: ignore[return-value]
+
+    def _prompt_inputs(
+        self,
+        document: schemas.SegmentedDocument,
+        classification: schemas.ClassificationResult,
+        simplification_result: schemas.SimplificationResult,
+        include_decision: bool,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, str]]:
         context: Dict[str, Any] = {
             "doc_type": classification.docType,
             "doc_subtype": classification.docSubtype,
         }
 
-        decision = getattr(simplification_result, "decisionFallo", None)
+        decision = simplification_result.decisionFallo if include_decision else None
         decision_dict = {}
         if decision:
+            # decisionFallo is a plain dict on SimplificationResult; accept
+            # attribute-style objects too through their __dict__.
+            d = decision if isinstance(decision, Mapping) else (getattr(decision, "__dict__", None) or {})
             decision_dict = {
-                "whoWins": getattr(decision, "whoWins", ""),
-                "costs": getattr(decision, "costs", ""),
-                "plainText": getattr(decision, "plainText", ""),
-                "falloLiteral": getattr(decision, "originalFalloQuote", ""),
+                "whoWins": d.get("whoWins") or "",
+                "costs": d.get("costs") or "",
+                "plainText": d.get("plainText") or "",
+                "falloLiteral": d.get("falloLiteral") or d.get("originalFalloQuote") or "",
             }
 
-        meta_dict: Dict[str, str] = {}
-        try:
-            extra = getattr(document.metadata, "extra", {}) if document.metadata else {}
-            meta_dict = {
-                "courtName": extra.get("courtName", ""),
-                "decisionDate": extra.get("decisionDate", ""),
-                "caseNumber": extra.get("caseNumber", ""),
-            }
-        except Exception:
-            meta_dict = {}
+        extra = document.extra_meta
+        meta_dict: Dict[str, str] = {
+            "courtName": extra.get("courtName", ""),
+            "decisionDate": extra.get("decisionDate", ""),
+            "caseNumber": extra.get("caseNumber", ""),
+        }
+
+        return context, decision_dict, meta_dict
 
+    def _cache_key(
+        self,
+        simplification_result: schemas.SimplificationResult,
+        context: Dict[str, Any],
+        decision_dict: Dict[str, Any],
+        meta_dict: Dict[str, str],
+    ) -> bytes | None:
+        if not self._cache_enabled:
+            return None
+        return content_key(
+            simplification_result.simplifiedText,
+            json.dumps([context, decision_dict, meta_dict], sort_keys=True, ensure_ascii=False),
+        )
+
+    def _generate(
+        self,
+        simplification_result: schemas.SimplificationResult,
+        context: Dict[str, Any],
+        decision_dict: Dict[str, Any],
+        meta_dict: Dict[str, str],
+        on_raw: Callable[[str], None] | None = None,
+    ) -> schemas.LegalGuide | None:
+        """Call the LLM and map its payload; ``None`` signals a failed call."""
         try:
-            if hasattr(self._client, "generate_guide") and callable(getattr(self._client, "generate_guide")):
+            if on_raw is None and hasattr(self._client, "generate_guide") and callable(getattr(self._client, "generate_guide")):
                 res = self._client.generate_guide(simplification_result.simplifiedText, {**context, **decision_dict, **meta_dict})
                 if isinstance(res, schemas.LegalGuide):
                     return res
@@ -58,30 +188,62 @@ class LegalGuideService:
                     simplification_result.simplifiedText, context, decision_dict, meta_dict
                 )
                 raw = self._client.chat(system, user, temperature=0.2)
+                if on_raw is not None:
+                    on_raw(raw)
                 data = self._client._parse_json(raw)
         except LLMClientError:
-            return self._fallback(meta_dict)
+            return None
         except Exception:
-            return self._fallback(meta_dict)
+            return None
+
+        return self._map_payload(data)
+
+    def _generate_batch(
+        self,
+        pending: Sequence[_PendingGuide],
+    ) -> List[schemas.LegalGuide | None] | None:
+        """One chat call for all pending items; ``None`` means use per-item calls."""
+        system = legal_guide_prompt.system_prompt()
+        user = legal_guide_prompt.batch_user_prompt(
+            [
+                (simplification_result.simplifiedText, context, decision_dict, meta_dict)
+                for _, _, simplification_result, context, decision_dict, meta_dict in pending
+            ]
+        )
+        try:
+            raw = self._client.chat(system, user, temperature=0.2)
+            data = self._client._parse_json(raw)
+        except Exception:
+            return None
+
+        entries = data.get("guides") if isinstance(data, dict) else data
+        if not isinstance(entries, list) or len(entries) != len(pending):
+            return None
+        if not all(isinstance(entry, dict) for entry in entries):
+            return None
+        return [self._map_payload(entry) for entry in entries]
 
-        meaning = data.get("meaning_for_you") or data.get("meaningForYou") or ""
-        todo = data.get("what_to_do_now") or data.get("whatToDoNow") or ""
-        next_ = data.get("what_happens_next") or data.get("whatHappensNext") or ""
-        deadlines = data.get("deadlines_and_risks") or data.get("deadlinesAndRisks") or ""
+    def _map_payload(self, data: Dict[str, Any]) -> schemas.LegalGuide:
+        # Accept snake_case and camelCase keys with one pass over the payload.
+        canon = {_canonical_key(key): value for key, value in data.items()}
+        meaning = canon.get("meaningforyou") or ""
+        todo = canon.get("whattodonow") or ""
+        next_ = canon.get("whathappensnext") or ""
+        deadlines = canon.get("deadlinesandrisks") or ""
 
         return schemas.LegalGuide(
-            meaningForYou=meaning or "Revisa la resolucion con ayuda profesional para entender sus efectos.",
-            whatToDoNow=todo or "Consulta con tu abogado que obligaciones y derechos se derivan del fallo.",
-            whatHappensNext=next_ or "Dependiendo del fallo, puede existir recurso; asesora sobre si conviene recurrir.",
-            deadlinesAndRisks=deadlines or "No se identifican plazos claros en el fallo; confirma posibles plazos legales generales.",
+            meaningForYou=meaning or DEFAULT_MEANING,
+            whatToDoNow=todo or DEFAULT_WHAT_TO_DO,
+            whatHappensNext=next_ or DEFAULT_WHAT_NEXT,
+            deadlinesAndRisks=deadlines or DEFAULT_DEADLINES,
             provider=self._client.provider_name,
         )
 
     def _fallback(self, meta: Dict[str, str]) -> schemas.LegalGuide:
         return schemas.LegalGuide(
-            meaningForYou="Revisa la resolucion con ayuda profesional para entender sus efectos.",
-            whatToDoNow="Consulta con tu abogado que obligaciones y derechos se derivan del fallo.",
-            whatHappensNext="Dependiendo del fallo, puede existir recurso; asesora sobre si conviene recurrir.",
-            deadlinesAndRisks="No se identifican plazos claros en el fallo; confirma posibles plazos legales generales.",
+            meaningForYou=DEFAULT_MEANING,
+            whatToDoNow=DEFAULT_WHAT_TO_DO,
+            whatHappensNext=DEFAULT_WHAT_NEXT,
+            deadlinesAndRisks=DEFAULT_DEADLINES,
             provider=self._client.provider_name,
         )
@@ -20,6 +20,37 @@ SECTION_KEYWORDS: Dict[str, List[str]] = {
     "PETICIONES": ["SUPLICO", "SOLICITO", "PETICION"],
 }
 
+# Frozen (section, keywords) table built once at import; SECTION_KEYWORDS stays
+# the editable source of truth.
+_SECTION_TABLE: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+    (section_name, tuple(keywords)) for section_name, keywords in SECTION_KEYWORDS.items()
+)
+
+# Upper-cases ASCII letters only: a length-preserving fallback for texts
+# where str.upper() would change offsets (e.g. "\u00df" -> "SS").
+_ASCII_UPPER = str.maketrans("abcdefghijklmnopqrstuvwxyz", "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# Headers opening the literal FALLO block and markers that close it.
+_FALLO_START_RE = re.compile(
+    r"(FALLO|PARTE DISPOSITIVA|DECISION|DECIDO|RESUELVO)",
+    re.IGNORECASE,
+)
+_FALLO_END_RE = re.compile(
+    r"(PROTECCION DE DATOS|PROTECCI[ÓO]N DE DATOS|FIRMA|FIRM[OA]|M[ÁA]NDO Y FIRMO|NOTIFIQUESE)",
+    re.IGNORECASE,
+)
+
+def _trimmed_end(text: str, start: int, end: int) -> int:
+    """Move ``end`` back over trailing whitespace without copying the slice."""
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+# Sections are built from values this module controls, so skip pydantic
+# validation (model_construct on v2, construct on v1).
+_new_section = getattr(schemas.DocumentSection, "model_construct", None) or schemas.DocumentSection.construct
+
 
 class NormalizationService:
     """Clean extracted text and produce structured sections."""
@@ -30,81 +61,81 @@ class NormalizationService:
         if not raw_text:
             raise ValueError("Ingest result is empty.")
 
-        cleaned = text_cleaning.sanitize_characters(raw_text)
-        cleaned = text_cleaning.remove_repeated_headers(cleaned)
-        cleaned = text_cleaning.normalize_whitespace(cleaned)
-
-        sections = self._segment_sections(cleaned)
+        cleaned = text_cleaning.clean_text(raw_text)
 
         fallo = self.extract_fallo_literal(cleaned)
-        if ingest_result.metadata is None:
-            ingest_result.metadata = None
-        try:
-            if ingest_result.metadata is not None:
-                extra = getattr(ingest_result.metadata, "extra", None)
-                if extra is None:
-                    ingest_result.metadata.extra = {}
-                if fallo:
-                    ingest_result.metadata.extra["falloLiteral"] = fallo
-        except Exception:
-            pass
+        if fallo and ingest_result.metadata is not None:
+            ingest_result.metadata.extra["falloLiteral"] = fallo
 
         segmented = schemas.SegmentedDocument(
             rawText=raw_text,
             normalizedText=cleaned,
-            sections=sections,
             metadata=ingest_result.metadata,
+            falloLiteral=fallo,
         )
-        try:
-            setattr(segmented, "falloLiteral", fallo)
-        except Exception:
-            pass
+        # Sectioning fills the document's upper-case cache, which the
+        # classification and safety rules reuse.
+        segmented.sections = self._segment_sections(cleaned, segmented.upper_text())
         return segmented
 
     def extract_fallo_literal(self, text: str) -> Optional[str]:
         """Extract the literal FALLO block using common headers and stopwords."""
+        span = self.extract_fallo_literal_span(text)
+        if span is None:
+            return None
+        start, end = span
+        return text[start:end]
+
+    def extract_fallo_literal_span(self, text: str) -> Optional[Tuple[int, int]]:
+        """Return the (start, end) offsets of the FALLO block, whitespace-trimmed.
+
+        The block is only sliced out by the caller, so no intermediate copy is
+        made while trimming.
+        """
         if not text:
             return None
 
-        start_pattern = re.compile(
-            r"(FALLO|PARTE DISPOSITIVA|DECISION|DECIDO|RESUELVO)",
-            re.IGNORECASE,
-        )
-        m = start_pattern.search(text)
+        m = _FALLO_START_RE.search(text)
         if not m:
             return None
         start = m.start()
 
-        end_pattern = re.compile(
-            r"(PROTECCION DE DATOS|PROTECCI[ÓO]N DE DATOS|FIRMA|FIRM[OA]|M[ÁA]NDO Y FIRMO|NOTIFIQUESE)",
-            re.IGNORECASE,
-        )
-        end_match = end_pattern.search(text, pos=m.end())
+        end_match = _FALLO_END_RE.search(text, pos=m.end())
         end = end_match.start() if end_match else len(text)
 
-        fallo_text = text[start:end].strip()
-        return fallo_text or None
+        # The start header is never whitespace; only the tail needs trimming.
+        end = _trimmed_end(text, start, end)
+        if end == start:
+            return None
+        return start, end
 
     # ------------------------------------------------------------------
     # Section heuristics
     # ------------------------------------------------------------------
-    def _segment_sections(self, text: str) -> List[schemas.DocumentSection]:
-        """Identify common Spanish legal sections via keyword spotting."""
+    def _segment_sections(self, text: str, upper: Optional[str] = None) -> List[schemas.DocumentSection]:
+        """Identify common Spanish legal sections via keyword spotting.
+
+        ``upper`` is the upper-cased text when the caller already has it
+        (SegmentedDocument.upper_text()); offsets found in it index ``text``.
+        """
         if not text:
             return []
 
-        upper = text.upper()
+        # One C-level find per keyword over an upper-cased copy beats a single
+        # IGNORECASE alternation scan by an order of magnitude.
+        if upper is None:
+            upper = text.upper()
+        if len(upper) != len(text):
+            upper = text.translate(_ASCII_UPPER)
         markers: List[Tuple[int, str]] = []
-
-        for section_name, keywords in SECTION_KEYWORDS.items():
-            matches = [upper.find(kw) for kw in keywords if kw in upper]
-            matches = [idx for idx in matches if idx >= 0]
-            if matches:
-                markers.append((min(matches), section_name))
+        for section_name, keywords in _SECTION_TABLE:
+            hits = [idx for idx in map(upper.find, keywords) if idx >= 0]
+            if hits:
+                markers.append((min(hits), section_name))
 
         if not markers:
             return [
-                schemas.DocumentSection(
+                _new_section(
                     name="CUERPO",
                     content=text.strip() or None,
                     confidence=0.3,
@@ -116,9 +147,11 @@ class NormalizationService:
 
         for idx, (start, name) in enumerate(markers):
             end = markers[idx + 1][0] if idx + 1 < len(markers) else len(text)
-            snippet = text[start:end].strip()
+            # Markers start on a keyword, so only the tail can be whitespace;
+            # slice once with tight bounds instead of slicing then strip().
+            snippet = text[start:_trimmed_end(text, start, end)]
             sections.append(
-                schemas.DocumentSection(
+                _new_section(
                     name=name,
                     content=snippet or None,
                     confidence=0.8 if snippet else 0.6,
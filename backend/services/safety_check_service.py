@@ -1,20 +1,114 @@
 """Safety verification service to ensure meaning preservation."""
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import json
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from .. import schemas
 from ..clients.llm_client import BaseLLMClient, LLMClientError
 from ..utils import date_amount_parsing
+from ..utils.content_cache import LRUCache, cache_enabled_from_env, content_key
 from ..prompt_templates import verifier as verifier_prompt
-import re
+from .simplification_service import derive_decision_from_fallo
+from concurrent.futures import ThreadPoolExecutor
+
+# Rule flag codes. Entity flags are a prefix followed by the missing value.
+FLAG_MISSING_FALLO_LITERAL = "MISSING_FALLO_LITERAL"
+FLAG_FALLO_POLARITY_MISMATCH = "FALLO_POLARITY_MISMATCH"
+FLAG_FALLO_COSTS_MISMATCH = "FALLO_COSTS_MISMATCH"
+MISSING_AMOUNT_PREFIX = "MISSING_AMOUNT:"
+MISSING_DATE_PREFIX = "MISSING_DATE:"
+MISSING_DEADLINE_PREFIX = "WARNING_MISSING_DEADLINE:"
+
+# Rule flags that make a document unsafe whatever the verifier says.
+HARD_FAIL_FLAGS = frozenset(
+    {FLAG_FALLO_POLARITY_MISMATCH, FLAG_FALLO_COSTS_MISMATCH, FLAG_MISSING_FALLO_LITERAL}
+)
+
+# Verifier input budget per text. Tokens are estimated at ~4 characters each
+# (Spanish prose with the usual BPE tokenizers); no tokenizer is bundled.
+VERIFIER_TOKEN_BUDGET = 1250
+CHARS_PER_TOKEN = 4
+
+# Minimum number of uncached verifier calls before evaluate_many packs them
+# into a single LLM request.
+BATCH_MIN = 4
+
+# (item index, cache key, guide, (original excerpt, simplified excerpt, guide payload))
+_PendingVerdict = Tuple[int, Optional[bytes], schemas.LegalGuide, Tuple[str, str, Any]]
+
+# decisionFallo labels folded onto the ones derive_decision_from_fallo
+# returns, so labels written by hand or by an LLM still compare.
+_WINNER_ALIASES: Dict[str, str] = {
+    "parte demandante": "actora",
+    "demandante": "actora",
+    "actora": "actora",
+    "parte demandada": "demandado",
+    "demandada": "demandado",
+    "demandado": "demandado",
+    "parcial": "parcial",
+}
+_COSTS_ALIASES: Dict[str, str] = {
+    "actora": "actora",
+    "demandante": "actora",
+    "demandado": "demandado",
+    "demandada": "demandado",
+    "sin_costas": "sin_costas",
+    "ninguno": "sin_costas",
+}
+
+# The verifier system prompt takes no parameters; build it once.
+_SYSTEM_PROMPT = verifier_prompt.system_prompt()
+
+# Shared worker pool for the deterministic checks that overlap the verifier call.
+_RULES_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="safety-rules")
+
+def _decision_field(decision: Any, name: str) -> str:
+    """Read ``name`` from decisionFallo, a dict on SimplificationResult or an object."""
+    value = decision.get(name) if isinstance(decision, dict) else getattr(decision, name, "")
+    return value or ""
+
+
+def _missing_sorted(orig: List[Any], simp: List[Any]) -> Iterator[Any]:
+    """Yield items of sorted ``orig`` absent from sorted ``simp`` (linear merge).
+
+    Walking both sorted lists also makes the flag order deterministic, unlike
+    iterating a set.
+    """
+    j = 0
+    n = len(simp)
+    for item in orig:
+        while j < n and simp[j] < item:
+            j += 1
+        if j == n or simp[j] != item:
+            yield item
 
 
 class SafetyCheckService:
     """Combine deterministic rules with LLM verification calls."""
 
-    def __init__(self, client: BaseLLMClient):
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        cache_enabled: bool | None = None,
+        cache_size: int = 256,
+        skip_llm_on_hard_fail: bool = False,
+    ):
         self._client = client
+        # Resolve the high-level verifier hook once instead of probing the
+        # client on every call; clients without it go through chat().
+        verify_safety = getattr(client, "verify_safety", None)
+        self._verify_safety = verify_safety if callable(verify_safety) else None
+        # When set, documents already failing a HARD_FAIL_FLAGS rule skip the
+        # verifier round-trip (llmVerdict is then None).
+        self._skip_llm_on_hard_fail = skip_llm_on_hard_fail
+        if cache_enabled is None:
+            cache_enabled = cache_enabled_from_env()
+        self._cache_enabled = cache_enabled
+        # Verifier answers keyed by the exact excerpts and guide sent to the
+        # LLM; only long-lived instances benefit (the API shares one through
+        # dependencies.py).
+        self._cache: LRUCache[Dict[str, Any]] = LRUCache(cache_size)
 
     def evaluate(
         self,
@@ -23,13 +117,82 @@ class SafetyCheckService:
         legal_guide: schemas.LegalGuide,
     ) -> schemas.SafetyCheckResult:
         """Run rule-based checks and optionally call the verifier model."""
-        rule_flags = self._rule_based_flags(original, simplification)
+        # The rules are pure CPU work and the verifier is a blocking network
+        # call: run the rules on a worker while this thread waits on the LLM.
+        rules_future = _RULES_EXECUTOR.submit(self._rule_based_flags, original, simplification)
+
+        critical_issues = self._critical_issues(simplification, legal_guide)
 
+        if self._skip_llm_on_hard_fail:
+            rule_flags = rules_future.result()
+            hard_fail = not HARD_FAIL_FLAGS.isdisjoint(rule_flags)
+            llm_output = None if hard_fail else self._call_verifier(original, simplification, legal_guide)
+        else:
+            llm_output = self._call_verifier(original, simplification, legal_guide)
+            rule_flags = rules_future.result()
+        return self._assemble(rule_flags, critical_issues, llm_output)
+
+    def evaluate_many(
+        self,
+        items: Sequence[Tuple[schemas.SegmentedDocument, schemas.SimplificationResult, schemas.LegalGuide]],
+    ) -> List[schemas.SafetyCheckResult]:
+        """Evaluate several documents, packing the verifier calls into one request.
+
+        Batches smaller than ``BATCH_MIN`` (after cache hits and hard-fail
+        skips) or clients without a chat interface use one call per document;
+        a malformed batch response also falls back to per-document calls.
+        """
+        if len(items) < BATCH_MIN or not callable(getattr(self._client, "chat", None)):
+            return [self.evaluate(*item) for item in items]
+
+        rules_futures = [
+            _RULES_EXECUTOR.submit(self._rule_based_flags, original, simplification)
+            for original, simplification, _ in items
+        ]
+        critical = [self._critical_issues(simplification, guide) for _, simplification, guide in items]
+
+        outputs: List[Dict[str, Any] | None] = [None] * len(items)
+        pending: List[_PendingVerdict] = []
+        for index, (original, simplification, guide) in enumerate(items):
+            if self._skip_llm_on_hard_fail and not HARD_FAIL_FLAGS.isdisjoint(rules_futures[index].result()):
+                continue
+            excerpts = self._verifier_inputs(original, simplification, guide)
+            key = self._verifier_key(*excerpts)
+            cached = self._cache.get(key) if key is not None else None
+            if cached is not None:
+                outputs[index] = cached
+            else:
+                pending.append((index, key, guide, excerpts))
+
+        verdicts: List[Tuple[Dict[str, Any] | None, bool]] | None = None
+        if len(pending) >= BATCH_MIN:
+            verdicts = self._verify_batch(pending)
+        if verdicts is None:
+            verdicts = [
+                self._verify(original_excerpt, simplified_excerpt, guide, guide_payload)
+                for _, _, guide, (original_excerpt, simplified_excerpt, guide_payload) in pending
+            ]
+
+        for (index, key, _, _), (output, cacheable) in zip(pending, verdicts):
+            if key is not None and cacheable:
+                self._cache.put(key, output)
+            outputs[index] = output
+
+        return [
+            self._assemble(future.result(), critical_issues, output)
+            for future, critical_issues, output in zip(rules_futures, critical, outputs)
+        ]
+
+    @staticmethod
+    def _critical_issues(
+        simplification: schemas.SimplificationResult,
+        legal_guide: schemas.LegalGuide,
+    ) -> List[schemas.SafetyIssue]:
         # Check: guide should not claim victory when whoWins is desconocido
         decision = getattr(simplification, "decisionFallo", None)
         who = ""
         try:
-            who = (decision.get("whoWins") if isinstance(decision, dict) else getattr(decision, "whoWins", "")) or ""
+            who = _decision_field(decision, "whoWins")
         except Exception:
             who = ""
         txt = simplification.simplifiedText.lower() if simplification.simplifiedText else ""
@@ -67,7 +230,14 @@ class SafetyCheckService:
             ):
                 add_crit("GUIDE_ASSERTS_VICTORY_WITHOUT_FALLO")
 
-        llm_output = self._call_verifier(original, simplification, legal_guide)
+        return critical_issues
+
+    @staticmethod
+    def _assemble(
+        rule_flags: List[str],
+        critical_issues: List[schemas.SafetyIssue],
+        llm_output: Dict[str, Any] | None,
+    ) -> schemas.SafetyCheckResult:
         issues = [schemas.SafetyIssue(code=flag, message=flag) for flag in rule_flags] + critical_issues
 
         if llm_output:
@@ -96,77 +266,51 @@ class SafetyCheckService:
     ) -> List[str]:
         flags: List[str] = []
 
-        fallo_literal = None
-        if original.metadata and getattr(original.metadata, "extra", None):
-            fallo_literal = original.metadata.extra.get("falloLiteral")
+        fallo_literal = original.extra_meta.get("falloLiteral")
         if not fallo_literal:
-            flags.append("MISSING_FALLO_LITERAL")
-
-        orig_text_full = (original.normalizedText or "").upper()
-        simp_text = (simplification.simplifiedText or "").upper()
-        orig_text_fallo = (fallo_literal or "").upper()
-
-        def _detect_winner_from_text(t: str) -> str:
-            if re.search(r"\b(SE\s+DESESTIMA|DESESTIMA|NO\s+HA\s+LUGAR)\b", t, re.IGNORECASE):
-                return "parte demandada"
-            if re.search(r"\b(SE\s+ESTIMA|ESTIMAR|SE\s+ACUERDA\s+ESTIMAR|FALLA\s+A\s+FAVOR)\b", t, re.IGNORECASE):
-                return "parte demandante"
-            return "desconocido"
-
-        def _detect_costs_from_text(t: str) -> str:
-            if re.search(r"\b(IMPONER|CONDENA|CONDENANDO)\s+EN\s+COSTAS\b", t, re.IGNORECASE) or re.search(r"\bCOSTAS\b.*\bIMPONEN\b", t, re.IGNORECASE):
-                return "completo"
-            if re.search(r"\b(SIN\s+COSTAS|NO\s+CONDENAR\s+EN\s+COSTAS)\b", t, re.IGNORECASE):
-                return "ninguno"
-            if re.search(r"\bCOSTAS\b.*\bPARCIAL\b", t, re.IGNORECASE) or re.search(r"\bPARCIALMENTE\b.*\bCOSTAS\b", t, re.IGNORECASE):
-                return "parcial"
-            return "desconocido"
-
-        orig_winner = _detect_winner_from_text(orig_text_fallo)
-        orig_costs = _detect_costs_from_text(orig_text_fallo)
+            flags.append(FLAG_MISSING_FALLO_LITERAL)
 
+        orig_text_full = original.upper_text()
+        # The extractors are case-insensitive, so the simplified text is
+        # scanned as-is and only the (few, short) matches are upper-cased to
+        # compare against the original's upper-cased matches.
+        simp_text = simplification.simplifiedText or ""
         decision = getattr(simplification, "decisionFallo", None)
 
         if decision:
-            simp_winner = (getattr(decision, "whoWins", "") or "").strip().lower() or "desconocido"
-            if simp_winner and simp_winner != "desconocido" and orig_winner and orig_winner != "desconocido":
-                norm_map = {
-                    "parte demandante": "parte demandante",
-                    "demandante": "parte demandante",
-                    "actora": "parte demandante",
-                    "parte demandada": "parte demandada",
-                    "demandada": "parte demandada",
-                    "demandado": "parte demandada",
-                    "parcial": "parcial",
-                }
-                simp_norm = norm_map.get(simp_winner, simp_winner)
-                orig_norm = norm_map.get(orig_winner, orig_winner)
-                if simp_norm != orig_norm:
-                    flags.append("FALLO_POLARITY_MISMATCH")
-
-            simp_costs = (getattr(decision, "costs", "") or "").strip().lower() or "desconocido"
-            if simp_costs and simp_costs != "desconocido" and orig_costs and orig_costs != "desconocido":
-                if simp_costs != orig_costs:
-                    flags.append("FALLO_COSTS_MISMATCH")
+            # Same detector as the simplification, so the two sides can only
+            # disagree when decisionFallo does not describe this FALLO.
+            orig_winner, orig_costs = derive_decision_from_fallo(fallo_literal)
+            simp_winner = _WINNER_ALIASES.get(_decision_field(decision, "whoWins").strip().lower())
+            if simp_winner and orig_winner != "desconocido" and simp_winner != orig_winner:
+                flags.append(FLAG_FALLO_POLARITY_MISMATCH)
+
+            simp_costs = _COSTS_ALIASES.get(_decision_field(decision, "costs").strip().lower())
+            if simp_costs and orig_costs != "desconocido" and simp_costs != orig_costs:
+                flags.append(FLAG_FALLO_COSTS_MISMATCH)
 
         try:
-            orig_amounts = set(date_amount_parsing.extract_amounts(orig_text_full))
-            simp_amounts = set(date_amount_parsing.extract_amounts(simp_text))
-            for amount in orig_amounts:
-                if amount not in simp_amounts:
-                    flags.append(f"MISSING_AMOUNT:{amount}")
-
-            orig_dates = set(date_amount_parsing.extract_dates(orig_text_full))
-            simp_dates = set(date_amount_parsing.extract_dates(simp_text))
-            for date in orig_dates:
-                if date not in simp_dates:
-                    flags.append(f"MISSING_DATE:{date}")
-
-            orig_deadlines = set(date_amount_parsing.extract_deadlines(orig_text_full))
-            simp_deadlines = set(date_amount_parsing.extract_deadlines(simp_text))
-            for d in orig_deadlines:
-                if d not in simp_deadlines:
-                    flags.append(f"WARNING_MISSING_DEADLINE:{d}")
+            # One combined scan per text; the simplified text is only scanned
+            # when the original has something to look for.
+            orig_found = date_amount_parsing.extract_all(orig_text_full)
+            orig_amounts = sorted(set(orig_found["amounts"]))
+            orig_dates = sorted(set(orig_found["dates"]))
+            orig_deadlines = sorted(set(orig_found["deadlines"]))
+            if orig_amounts or orig_dates or orig_deadlines:
+                simp_found = date_amount_parsing.extract_all(simp_text)
+                if orig_amounts:
+                    simp_amounts = sorted({m.upper() for m in simp_found["amounts"]})
+                    flags.extend(
+                        MISSING_AMOUNT_PREFIX + amount for amount in _missing_sorted(orig_amounts, simp_amounts)
+                    )
+                if orig_dates:
+                    simp_dates = sorted({m.upper() for m in simp_found["dates"]})
+                    flags.extend(MISSING_DATE_PREFIX + date for date in _missing_sorted(orig_dates, simp_dates))
+                if orig_deadlines:
+                    simp_deadlines = sorted({m.upper() for m in simp_found["deadlines"]})
+                    flags.extend(
+                        MISSING_DEADLINE_PREFIX + d for d in _missing_sorted(orig_deadlines, simp_deadlines)
+                    )
         except Exception:
             pass
 
@@ -178,9 +322,73 @@ class SafetyCheckService:
         simplification: schemas.SimplificationResult,
         legal_guide: schemas.LegalGuide,
     ) -> Dict[str, Any] | None:
+        original_excerpt, simplified_excerpt, guide_payload = self._verifier_inputs(
+            original, simplification, legal_guide
+        )
+        key = self._verifier_key(original_excerpt, simplified_excerpt, guide_payload)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        result, cacheable = self._verify(original_excerpt, simplified_excerpt, legal_guide, guide_payload)
+        if key is not None and cacheable:
+            self._cache.put(key, result)
+        return result
+
+    def _verifier_inputs(
+        self,
+        original: schemas.SegmentedDocument,
+        simplification: schemas.SimplificationResult,
+        legal_guide: schemas.LegalGuide,
+    ) -> Tuple[str, str, Any]:
+        """(original excerpt, simplified excerpt, guide payload) sent to the verifier."""
+        return (
+            self._original_excerpt(original),
+            simplification.simplifiedText[: VERIFIER_TOKEN_BUDGET * CHARS_PER_TOKEN],
+            legal_guide.model_dump() if hasattr(legal_guide, "model_dump") else str(legal_guide),
+        )
+
+    def _verifier_key(self, original_excerpt: str, simplified_excerpt: str, guide_payload: Any) -> bytes | None:
+        if not self._cache_enabled:
+            return None
+        return content_key(
+            original_excerpt,
+            simplified_excerpt,
+            json.dumps(guide_payload, sort_keys=True, ensure_ascii=False, default=str),
+        )
+
+    @staticmethod
+    def _original_excerpt(original: schemas.SegmentedDocument) -> str:
+        """Fit the original into the verifier budget, keeping the FALLO first.
+
+        A plain prefix cut drops the FALLO of long rulings, which is what the
+        verifier most needs; lead with it when the prefix would miss it.
+        """
+        budget = VERIFIER_TOKEN_BUDGET * CHARS_PER_TOKEN
+        text = original.normalizedText
+        if len(text) <= budget:
+            return text
+        fallo = original.falloLiteral or original.extra_meta.get("falloLiteral")
+        if not fallo or text.find(fallo, 0, budget) != -1:
+            return text[:budget]
+        fallo = fallo[:budget]
+        remaining = budget - len(fallo) - 2
+        if remaining <= 0:
+            return fallo
+        return fallo + "\n\n" + text[:remaining]
+
+    def _verify(
+        self,
+        original_excerpt: str,
+        simplified_excerpt: str,
+        legal_guide: schemas.LegalGuide,
+        guide_payload: Any,
+    ) -> Tuple[Dict[str, Any] | None, bool]:
+        """Ask the verifier; the flag tells whether the answer may be cached."""
         try:
-            if hasattr(self._client, "verify_safety") and callable(getattr(self._client, "verify_safety")):
-                result = self._client.verify_safety(original.normalizedText[:5000], simplification.simplifiedText[:5000], legal_guide)
+            if self._verify_safety is not None:
+                result = self._verify_safety(original_excerpt, simplified_excerpt, legal_guide)
                 if isinstance(result, dict):
                     warnings = result.get("warnings") or result.get("alerts") or []
                     if not isinstance(warnings, list):
@@ -190,37 +398,62 @@ class SafetyCheckService:
                         "warnings": warnings,
                         "verdict": result.get("verdict") or result.get("summary") or None,
                         "raw_response": result.get("raw_response") or str(result),
-                    }
+                    }, True
                 if hasattr(result, "isSafe"):
                     return {
                         "is_safe": bool(getattr(result, "isSafe")),
                         "warnings": [i.message for i in getattr(result, "issues", [])],
                         "verdict": getattr(result, "llmVerdict", None),
                         "raw_response": str(result),
-                    }
+                    }, True
 
-            system = verifier_prompt.system_prompt()
+            system = _SYSTEM_PROMPT
             user = verifier_prompt.user_prompt(
-                original.normalizedText[:5000],
-                simplification.simplifiedText[:5000],
-                legal_guide.model_dump() if hasattr(legal_guide, "model_dump") else str(legal_guide),
+                original_excerpt,
+                simplified_excerpt,
+                guide_payload,
             )
             raw = self._client.chat(system, user, temperature=0.0)
             try:
                 data = self._client._parse_json(raw)
             except LLMClientError:
-                return {"is_safe": False, "warnings": ["No se ha podido verificar correctamente el significado."], "raw_response": raw}
-
-            warnings = data.get("warnings") or data.get("alerts") or []
-            if not isinstance(warnings, list):
-                warnings = [str(warnings)]
-
-            result = {
-                "is_safe": bool(data.get("is_safe", data.get("safe", False))),
-                "warnings": warnings,
-                "verdict": data.get("verdict") or data.get("summary") or None,
-                "raw_response": raw,
-            }
-            return result
+                # Unparseable verdicts are not cached so a retry asks again.
+                return {"is_safe": False, "warnings": ["No se ha podido verificar correctamente el significado."], "raw_response": raw}, False
+
+            return self._verdict_from_payload(data, raw), True
         except LLMClientError:
+            return None, False
+
+    def _verify_batch(
+        self,
+        pending: Sequence[_PendingVerdict],
+    ) -> List[Tuple[Dict[str, Any] | None, bool]] | None:
+        """One chat call for all pending items; ``None`` means use per-item calls."""
+        system = _SYSTEM_PROMPT
+        user = verifier_prompt.batch_user_prompt([excerpts for _, _, _, excerpts in pending])
+        try:
+            raw = self._client.chat(system, user, temperature=0.0)
+            data = self._client._parse_json(raw)
+        except (LLMClientError, ValueError):
+            # Provider errors and undecodable payloads fall back to per-item
+            # calls; anything else is a bug and propagates.
+            return None
+
+        entries = data.get("results") if isinstance(data, dict) else data
+        if not isinstance(entries, list) or len(entries) != len(pending):
+            return None
+        if not all(isinstance(entry, dict) for entry in entries):
             return None
+        return [(self._verdict_from_payload(entry, raw), True) for entry in entries]
+
+    @staticmethod
+    def _verdict_from_payload(data: Dict[str, Any], raw: str) -> Dict[str, Any]:
+        warnings = data.get("warnings") or data.get("alerts") or []
+        if not isinstance(warnings, list):
+            warnings = [str(warnings)]
+        return {
+            "is_safe": bool(data.get("is_safe", data.get("safe", False))),
+            "warnings": warnings,
+            "verdict": data.get("verdict") or data.get("summary") or None,
+            "raw_response": raw,
+        }
@@ -1,12 +1,147 @@
 """LLM-based simplification with deterministic fallo coherence."""
 from __future__ import annotations
 
-from typing import Dict, Any, List, Tuple
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Any, Iterator, List, Sequence, Tuple
 import re
 
 from .. import schemas
 from ..clients.llm_client import BaseLLMClient, LLMClientError
 from ..prompt_templates import simplification as simplification_prompt
+from ..utils.content_cache import LRUCache, cache_enabled_from_env, content_key
+
+# whoWins / costs phrases of the FALLO, matched case-insensitively in one scan
+# without upper-casing the text. Alternatives are lookaheads so overlapping
+# phrases ("SE ESTIMA PARCIALMENTE") all register; priority is applied when
+# decoding. The word boundary before ESTIMA keeps "DESESTIMA LA DEMANDA" from
+# being read as a win for the plaintiff.
+_DECISION_RE = re.compile(
+    r"(?=(?P<parcial>\bESTIMA PARCIAL))"
+    r"|(?=(?P<actora>\bSE ESTIMA|\bESTIMA LA DEMANDA))"
+    r"|(?=(?P<demandado>SE DESESTIMA|DESESTIMA LA DEMANDA|RECHAZA COMPLETAMENTE))"
+    r"|(?=(?P<costs_actora>COSTAS A LA PARTE ACTORA|COSTAS A LA ACTORA))"
+    r"|(?=(?P<costs_demandado>COSTAS A LA PARTE DEMANDADA|COSTAS A LA DEMANDADA))"
+    r"|(?=(?P<sin_costas>SIN ESPECIAL PRONUNCIAMIENTO))",
+    re.IGNORECASE,
+)
+
+# Each _DECISION_RE group sets one bit in a who/costs mask; bit order is the
+# decoding priority (lowest bit wins).
+_WHO_GROUPS = ("parcial", "actora", "demandado")
+_COSTS_GROUPS = ("costs_actora", "costs_demandado", "sin_costas")
+_DECISION_BITS: Dict[str, Tuple[int, int]] = {
+    **{name: (1 << bit, 0) for bit, name in enumerate(_WHO_GROUPS)},
+    **{name: (0, 1 << bit) for bit, name in enumerate(_COSTS_GROUPS)},
+}
+
+
+def _decode_table(values: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Map every mask to the value of its lowest set bit ("desconocido" for 0)."""
+    return tuple(
+        values[(mask & -mask).bit_length() - 1] if mask else "desconocido"
+        for mask in range(1 << len(values))
+    )
+
+
+_WHO_BY_MASK = _decode_table(("parcial", "actora", "demandado"))
+_COSTS_BY_MASK = _decode_table(("actora", "demandado", "sin_costas"))
+
+
+def derive_decision_from_fallo(fallo_literal: str | None) -> Tuple[str, str]:
+    """Return (whoWins, costs) read deterministically from the literal FALLO.
+
+    The single source for these labels: the simplification stores them in
+    decisionFallo and the safety checker re-derives them to compare.
+    """
+    if not fallo_literal:
+        return "desconocido", "desconocido"
+
+    who_mask = costs_mask = 0
+    for match in _DECISION_RE.finditer(fallo_literal):
+        who_bit, costs_bit = _DECISION_BITS[match.lastgroup]
+        who_mask |= who_bit
+        costs_mask |= costs_bit
+        if who_mask & 1 and costs_mask & 1:
+            break  # Both answers are already at their highest priority.
+
+    return _WHO_BY_MASK[who_mask], _COSTS_BY_MASK[costs_mask]
+
+# Simplification strategy per (docType, docSubtype), then per docType alone;
+# anything else uses "generic".
+_STRATEGY_BY_PAIR: Dict[Tuple[str, str], str] = {
+    ("RESOLUCION_JURIDICA", "SENTENCIA"): "resolution",
+    ("RESOLUCION_JURIDICA", "AUTO"): "resolution",
+    ("RESOLUCION_JURIDICA", "DECRETO"): "resolution",
+    ("ESCRITO_PROCESAL", "DEMANDA"): "procedural_filing",
+    ("ESCRITO_PROCESAL", "RECURSO"): "procedural_filing",
+}
+_STRATEGY_BY_TYPE: Dict[str, str] = {
+    "RESOLUCION_JURIDICA": "resolution_generic",
+    "ESCRITO_PROCESAL": "procedural_generic",
+}
+
+# Stands in for the FALLO inside the prompt body; the literal itself is sent
+# once in the FALLO_LITERAL block.
+FALLO_PLACEHOLDER = "[FALLO: ver bloque FALLO_LITERAL]"
+
+# Sentence-ending punctuation followed by whitespace; used to truncate long
+# prompts on a sentence boundary when there is no paragraph break to use.
+_SENTENCE_END_RE = re.compile(r"[.;!?](?=\s)")
+
+# Section names kept for the result's importantSections, most relevant first.
+_IMPORTANT_SECTION_PRIORITY = (
+    "ENCABEZADO",
+    "ANTECEDENTES DE HECHO",
+    "FUNDAMENTOS DE DERECHO",
+    "FUNDAMENTOS JURIDICOS",
+    "FALLO",
+    "PETICIONES",
+)
+
+# Citizen-facing rendering of the structured simplification. The optional
+# representative and FALLO lines are filled with the sub-templates below or
+# with "" when the value is empty.
+_SIMPLIFIED_TEMPLATE = (
+    "[1] Datos del caso\n"
+    "- Fecha: {date}\n"
+    "- Juzgado: {court}\n"
+    "- Jueza/Juez: {judge}\n"
+    "- Numero de caso: {case_number}\n"
+    "- Numero de resolucion: {resolution_number}\n"
+    "- Tipo de documento: {doc_type} - {doc_subtype}\n"
+    "\n"
+    "[2] Partes involucradas\n"
+    "- Demandante: {plaintiff}\n"
+    "{plaintiff_representatives}"
+    "- Demandado: {defendant}\n"
+    "{defendant_representatives}"
+    "\n"
+    "[3] Lo que paso antes (contexto procesal)\n"
+    "{procedural_context}\n"
+    "\n"
+    "[4] Resultado del caso (segun el FALLO)\n"
+    "- Quien gana: {who_wins}\n"
+    "- Costas: {costs}\n"
+    "- Resumen breve: {plain_text}\n"
+    "{fallo_literal}"
+)
+_REPRESENTATIVES_LINE = "  Representantes: {}\n"
+_FALLO_LITERAL_LINES = "- Fallo literal:\n{}\n"
+
+# Failures that degrade to the deterministic result: provider/transport errors
+# (clients wrap them in LLMClientError) and undecodable payloads (json and
+# orjson decode errors are ValueErrors). Anything else is a bug and propagates.
+_LLM_FAILURES = (LLMClientError, ValueError)
+
+# A document skips the LLM when its FALLO decides the outcome and the caller
+# already supplied these metadata / party fields (see force_llm).
+_DETERMINISTIC_METADATA = ("courtName", "decisionDate", "caseNumber")
+_DETERMINISTIC_PARTIES = ("plaintiffName", "defendantName")
+DETERMINISTIC_PROVIDER = "deterministic"
+
+# The simplification system prompt takes no parameters; build it once.
+_SYSTEM_PROMPT = simplification_prompt.system_prompt()
 
 
 class SimplificationService:
@@ -17,22 +152,49 @@ class SimplificationService:
 
     MAX_CHARS = 12000
     HARD_LIMIT = 16000
-
-    def __init__(self, client: BaseLLMClient):
+    # simplify_many packs at least BATCH_MIN documents into one request when
+    # their combined text fits in BATCH_CHAR_LIMIT characters.
+    BATCH_MIN = 4
+    BATCH_CHAR_LIMIT = 12000
+    # FALLO literals at least this long are elided from the prompt body.
+    FALLO_ELIDE_MIN = 200
+    # Longer ANTECEDENTES need the LLM to summarise the procedural context, so
+    # they rule out the deterministic path.
+    DETERMINISTIC_CONTEXT_MAX = 200
+
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        max_concurrency: int = 4,
+        cache_enabled: bool | None = None,
+        cache_size: int = 256,
+        force_llm: bool = False,
+    ):
+        """With ``force_llm=True`` every document goes to the LLM, even when the
+        FALLO and caller-supplied metadata already determine the result."""
         self._client = client
+        self._max_concurrency = max(1, max_concurrency)
+        self._force_llm = force_llm
+        if cache_enabled is None:
+            cache_enabled = cache_enabled_from_env()
+        self._cache_enabled = cache_enabled
+        # Parsed LLM payloads keyed by the exact prompt, which already carries
+        # the text, document type, FALLO, metadata and parties.
+        self._cache: LRUCache[Dict[str, Any]] = LRUCache(cache_size)
+        # In-flight async LLM fetch tasks keyed by (event loop, prompt digest).
+        self._inflight: Dict[Tuple[asyncio.AbstractEventLoop, bytes], asyncio.Task] = {}
 
     def simplify(
         self,
         document: schemas.SegmentedDocument,
         classification: schemas.ClassificationResult,
+        on_raw: Callable[[str], None] | None = None,
     ) -> schemas.SimplificationResult:
-        doc_type = classification.docType or "OTRO"
-        doc_subtype = classification.docSubtype or "DESCONOCIDO"
-        strategy = self._select_strategy(doc_type, doc_subtype)
-
-        fallo_literal = getattr(document, "falloLiteral", None) or getattr(document, "fallbackFallo", None)
-        metadata = self._collect_metadata(document)
-        parties = self._collect_parties(document)
+        """Simplify the document; ``on_raw`` receives the raw LLM payload before parsing."""
+        doc_type, doc_subtype, fallo_literal, metadata, parties = self._prepare(document, classification)
+        result = self._deterministic_result(document, doc_type, doc_subtype, fallo_literal, metadata, parties)
+        if result is not None:
+            return result
 
         payload, was_truncated = self._call_llm(
             document,
@@ -41,21 +203,233 @@ class SimplificationService:
             fallo_literal,
             metadata,
             parties,
+            on_raw,
+        )
+        return self._build_result(document, doc_type, doc_subtype, fallo_literal, payload, was_truncated)
+
+    def simplify_many(
+        self,
+        items: Sequence[Tuple[schemas.SegmentedDocument, schemas.ClassificationResult]],
+    ) -> List[schemas.SimplificationResult]:
+        """Simplify several documents with at most ``max_concurrency`` LLM calls in flight.
+
+        Short documents (``BATCH_MIN`` or more, at most ``BATCH_CHAR_LIMIT``
+        characters in total) are packed into one chat request so the shared
+        system prompt is sent once; a malformed batch answer falls back to
+        per-document calls. Each call is a blocking network round-trip, so
+        documents run in worker threads. Results keep the input order; the
+        first failure is raised. Identical (document, classification) pairs
+        are simplified once and the result is copied to every duplicate.
+        """
+        if len(items) <= 1:
+            return [self.simplify(document, classification) for document, classification in items]
+
+        positions: Dict[bytes, int] = {}
+        unique: List[Tuple[schemas.SegmentedDocument, schemas.ClassificationResult]] = []
+        slots: List[int] = []
+        for document, classification in items:
+            key = content_key(document.model_dump_json(), classification.docType, classification.docSubtype)
+            slot = positions.get(key)
+            if slot is None:
+                slot = positions[key] = len(unique)
+                unique.append((document, classification))
+            slots.append(slot)
+
+        results = self._simplify_unique(unique)
+        if len(unique) == len(items):
+            return results
+        seen = set()
+        out: List[schemas.SimplificationResult] = []
+        for slot in slots:
+            # Duplicates get their own copy so callers can mutate results freely.
+            out.append(results[slot] if slot not in seen else results[slot].model_copy(deep=True))
+            seen.add(slot)
+        return out
+
+    async def asimplify(
+        self,
+        document: schemas.SegmentedDocument,
+        classification: schemas.ClassificationResult,
+    ) -> schemas.SimplificationResult:
+        """Awaitable ``simplify``; the LLM round-trip does not hold a thread."""
+        doc_type, doc_subtype, fallo_literal, metadata, parties = self._prepare(document, classification)
+        result = self._deterministic_result(document, doc_type, doc_subtype, fallo_literal, metadata, parties)
+        if result is not None:
+            return result
+
+        payload, was_truncated = await self._acall_llm(
+            document,
+            doc_type,
+            doc_subtype,
+            fallo_literal,
+            metadata,
+            parties,
+        )
+        return self._build_result(document, doc_type, doc_subtype, fallo_literal, payload, was_truncated)
+
+    async def asimplify_many(
+        self,
+        items: Sequence[Tuple[schemas.SegmentedDocument, schemas.ClassificationResult]],
+    ) -> List[schemas.SimplificationResult]:
+        """Async variant of simplify_many for event-loop callers.
+
+        Documents are simplified concurrently with at most
+        ``max_concurrency`` LLM calls in flight. Results keep the input order;
+        the first failure is raised.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def process(
+            document: schemas.SegmentedDocument, classification: schemas.ClassificationResult
+        ) -> schemas.SimplificationResult:
+            async with semaphore:
+                return await self.asimplify(document, classification)
+
+        return list(await asyncio.gather(*(process(document, classification) for document, classification in items)))
+
+    def _simplify_unique(
+        self,
+        items: Sequence[Tuple[schemas.SegmentedDocument, schemas.ClassificationResult]],
+    ) -> List[schemas.SimplificationResult]:
+        if len(items) <= 1:
+            return [self.simplify(document, classification) for document, classification in items]
+
+        if len(items) >= self.BATCH_MIN and callable(getattr(self._client, "chat", None)):
+            results = self._simplify_packed(items)
+            if results is not None:
+                return results
+
+        workers = min(len(items), self._max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simplify") as pool:
+            return list(pool.map(lambda item: self.simplify(*item), items))
+
+    def simplify_iter(
+        self,
+        items: Sequence[Tuple[schemas.SegmentedDocument, schemas.ClassificationResult]],
+    ) -> Iterator[Tuple[int, schemas.SimplificationResult]]:
+        """Yield ``(index, result)`` pairs as soon as each document is simplified.
+
+        Completion order, not input order: callers streaming results (e.g. as
+        server-sent events) can forward each one without waiting for the
+        slowest document. The first failure is raised when it is reached.
+        """
+        if not items:
+            return
+        workers = min(len(items), self._max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simplify") as pool:
+            futures = {
+                pool.submit(self.simplify, document, classification): index
+                for index, (document, classification) in enumerate(items)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _simplify_packed(
+        self,
+        items: Sequence[Tuple[schemas.SegmentedDocument, schemas.ClassificationResult]],
+    ) -> List[schemas.SimplificationResult] | None:
+        prepared = [self._prepare(document, classification) for document, classification in items]
+        results: List[schemas.SimplificationResult | None] = [
+            self._deterministic_result(document, *inputs) for (document, _), inputs in zip(items, prepared)
+        ]
+        pending = [index for index, result in enumerate(results) if result is None]
+        if len(pending) < self.BATCH_MIN:
+            return None
+
+        texts = [self._prompt_text(items[index][0], prepared[index][2]) for index in pending]
+        if any(truncated for _, truncated in texts) or sum(len(text) for text, _ in texts) > self.BATCH_CHAR_LIMIT:
+            return None
+
+        payloads = self._call_llm_batch(
+            [(text, *prepared[index]) for (text, _), index in zip(texts, pending)]
+        )
+        if payloads is None:
+            return None
+        for index, payload in zip(pending, payloads):
+            doc_type, doc_subtype, fallo_literal, _, _ = prepared[index]
+            results[index] = self._build_result(
+                items[index][0], doc_type, doc_subtype, fallo_literal, payload, False
+            )
+        return results  # type: ignore[return-value]
+
+    def _prepare(
+        self,
+        document: schemas.SegmentedDocument,
+        classification: schemas.ClassificationResult,
+    ) -> Tuple[str, str, str | None, Dict[str, str], Dict[str, str]]:
+        doc_type = classification.docType or "OTRO"
+        doc_subtype = classification.docSubtype or "DESCONOCIDO"
+        fallo_literal = document.falloLiteral
+        metadata = self._collect_metadata(document)
+        parties = self._collect_parties(document)
+        return doc_type, doc_subtype, fallo_literal, metadata, parties
+
+    def _deterministic_result(
+        self,
+        document: schemas.SegmentedDocument,
+        doc_type: str,
+        doc_subtype: str,
+        fallo_literal: str | None,
+        metadata: Dict[str, str],
+        parties: Dict[str, str],
+    ) -> schemas.SimplificationResult | None:
+        """Result built without the LLM, or ``None`` when the LLM is needed.
+
+        The outcome always comes from the FALLO (see _normalize_payload), so
+        once the header and parties are known the LLM would only add the
+        procedural summary; short ANTECEDENTES are used verbatim instead.
+        """
+        if self._force_llm or not fallo_literal:
+            return None
+        if not all(metadata.get(field) for field in _DETERMINISTIC_METADATA):
+            return None
+        if not all(parties.get(field) for field in _DETERMINISTIC_PARTIES):
+            return None
+        context = next(
+            (sec.content or "" for sec in document.sections if (sec.name or "").upper() == "ANTECEDENTES DE HECHO"),
+            "",
+        ).strip()
+        if len(context) > self.DETERMINISTIC_CONTEXT_MAX:
+            return None
+
+        payload = {
+            "headerSummary": {
+                "court": metadata["courtName"],
+                "date": metadata["decisionDate"],
+                "caseNumber": metadata["caseNumber"],
+                "resolutionNumber": metadata.get("resolutionNumber", ""),
+                "procedureType": metadata.get("procedureType", ""),
+                "judge": metadata.get("judgeName", ""),
+            },
+            "partiesSummary": {
+                "plaintiff": parties["plaintiffName"],
+                "plaintiffRepresentatives": parties.get("plaintiffRepresentatives", ""),
+                "defendant": parties["defendantName"],
+                "defendantRepresentatives": parties.get("defendantRepresentatives", ""),
+            },
+            "proceduralContext": context,
+        }
+        return self._build_result(
+            document, doc_type, doc_subtype, fallo_literal, payload, False, provider=DETERMINISTIC_PROVIDER
         )
+
+    def _build_result(
+        self,
+        document: schemas.SegmentedDocument,
+        doc_type: str,
+        doc_subtype: str,
+        fallo_literal: str | None,
+        payload: Dict[str, Any],
+        was_truncated: bool,
+        provider: str | None = None,
+    ) -> schemas.SimplificationResult:
+        strategy = self._select_strategy(doc_type, doc_subtype)
         structured = self._normalize_payload(payload, fallo_literal)
 
         simplified_text = self._render_simplified_text(structured, doc_type, doc_subtype)
 
         important_sections = self._important_sections(document)
 
-        # Map structured decision to dict for schema
-        decision_dict = {
-            "whoWins": structured["decisionFallo"]["whoWins"],
-            "costs": structured["decisionFallo"]["costs"],
-            "plainText": structured["decisionFallo"]["plainText"],
-            "falloLiteral": structured["decisionFallo"]["falloLiteral"],
-        }
-
         warnings: List[str] = []
         if was_truncated:
             warnings.append(
@@ -69,10 +443,11 @@ class SimplificationService:
             headerSummary=structured["headerSummary"],
             partiesSummary=structured["partiesSummary"],
             proceduralContext=structured["proceduralContext"],
-            decisionFallo=decision_dict,
+            # _normalize_payload already builds exactly the schema's four keys.
+            decisionFallo=structured["decisionFallo"],
             importantSections=important_sections,
             strategy=strategy,
-            provider=self._client.provider_name,
+            provider=provider or self._client.provider_name,
             truncated=was_truncated,
             warnings=warnings,
         )
@@ -88,15 +463,96 @@ class SimplificationService:
         fallo_literal: str | None,
         metadata: Dict[str, str],
         parties: Dict[str, str],
+        on_raw: Callable[[str], None] | None = None,
     ) -> tuple[Dict[str, Any], bool]:
-        text = document.normalizedText or document.rawText or ""
-        truncated = False
-        if len(text) > self.MAX_CHARS:
-            truncated = True
-            limit = self.HARD_LIMIT if len(text) > self.HARD_LIMIT else self.MAX_CHARS
-            text = text[:limit]
+        system, user, key, truncated = self._llm_request(
+            document, doc_type, doc_subtype, fallo_literal, metadata, parties
+        )
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached, truncated
+        if not callable(getattr(self._client, "chat", None)):
+            return {}, truncated
+
+        try:
+            raw = self._client.chat(system, user, temperature=0.1)
+            if on_raw is not None:
+                on_raw(raw)
+            payload = self._client._parse_json(raw)
+        except _LLM_FAILURES:
+            return {}, truncated
+
+        if key is not None and isinstance(payload, dict) and payload:
+            self._cache.put(key, payload)
+        return payload, truncated
 
-        system = simplification_prompt.system_prompt()
+    async def _acall_llm(
+        self,
+        document: schemas.SegmentedDocument,
+        doc_type: str,
+        doc_subtype: str,
+        fallo_literal: str | None,
+        metadata: Dict[str, str],
+        parties: Dict[str, str],
+    ) -> tuple[Dict[str, Any], bool]:
+        """Awaitable ``_call_llm``; uses the client's ``achat`` when it has one.
+
+        Concurrent calls with the same prompt on one event loop share a single
+        fetch task, which outlives any caller that gets cancelled.
+        """
+        system, user, key, truncated = self._llm_request(
+            document, doc_type, doc_subtype, fallo_literal, metadata, parties
+        )
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached, truncated
+
+        loop = asyncio.get_running_loop()
+        flight = (loop, key if key is not None else content_key(system, user))
+        task = self._inflight.get(flight)
+        if task is None:
+            # The fetch runs as its own task and every caller awaits it through
+            # shield(), so cancelling one caller (e.g. a client disconnect)
+            # never cancels the request the others are waiting on.
+            task = loop.create_task(self._afetch(system, user, key))
+            self._inflight[flight] = task
+            task.add_done_callback(lambda done: self._inflight.pop(flight, None))
+        return await asyncio.shield(task), truncated
+
+    async def _afetch(self, system: str, user: str, key: bytes | None) -> Dict[str, Any]:
+        """Fetch and parse one payload, caching it under ``key`` when useful."""
+        achat = getattr(self._client, "achat", None)
+        chat = getattr(self._client, "chat", None)
+        if not callable(achat) and not callable(chat):
+            return {}
+
+        try:
+            if callable(achat):
+                raw = await achat(system, user, temperature=0.1)
+            else:
+                raw = await asyncio.to_thread(chat, system, user, temperature=0.1)
+            payload = self._client._parse_json(raw)
+        except _LLM_FAILURES:
+            return {}
+        if key is not None and isinstance(payload, dict) and payload:
+            self._cache.put(key, payload)
+        return payload
+
+    def _llm_request(
+        self,
+        document: schemas.SegmentedDocument,
+        doc_type: str,
+        doc_subtype: str,
+        fallo_literal: str | None,
+        metadata: Dict[str, str],
+        parties: Dict[str, str],
+    ) -> Tuple[str, str, bytes | None, bool]:
+        """Return (system prompt, user prompt, cache key, truncated) for one document."""
+        text, truncated = self._prompt_text(document, fallo_literal)
+
+        system = _SYSTEM_PROMPT
         user = simplification_prompt.user_prompt(
             text,
             doc_type=doc_type,
@@ -105,12 +561,69 @@ class SimplificationService:
             metadata=metadata,
             parties=parties,
         )
+        key = content_key(system, user) if self._cache_enabled else None
+        return system, user, key, truncated
 
+    def _call_llm_batch(
+        self,
+        prepared: Sequence[Tuple[str, str, str, str | None, Dict[str, str], Dict[str, str]]],
+    ) -> List[Dict[str, Any]] | None:
+        """One chat call for all prepared documents; ``None`` means use per-document calls."""
+        system = _SYSTEM_PROMPT
+        user = simplification_prompt.batch_user_prompt(prepared)
         try:
             raw = self._client.chat(system, user, temperature=0.1)
-            return self._client._parse_json(raw), truncated
-        except Exception:
-            return {}, truncated
+            data = self._client._parse_json(raw)
+        except _LLM_FAILURES:
+            return None
+
+        entries = data.get("documents") if isinstance(data, dict) else data
+        if not isinstance(entries, list) or len(entries) != len(prepared):
+            return None
+        if not all(isinstance(entry, dict) for entry in entries):
+            return None
+        return entries
+
+    def _prompt_text(
+        self, document: schemas.SegmentedDocument, fallo_literal: str | None = None
+    ) -> Tuple[str, bool]:
+        """Text sent to the LLM and whether it had to be truncated.
+
+        The FALLO is already sent verbatim in its own prompt block, so a long
+        literal is replaced in the body by a short pointer to that block
+        instead of being paid for twice.
+        """
+        text = document.normalizedText or document.rawText or ""
+        start = end = -1
+        if fallo_literal and len(fallo_literal) >= self.FALLO_ELIDE_MIN:
+            start = text.find(fallo_literal)
+            if start != -1:
+                end = start + len(fallo_literal)
+        length = len(text) if start == -1 else len(text) - (end - start) + len(FALLO_PLACEHOLDER)
+        if length <= self.MAX_CHARS:
+            if start == -1:
+                return text, False
+            return text[:start] + FALLO_PLACEHOLDER + text[end:], False
+        limit = self.HARD_LIMIT if length > self.HARD_LIMIT else self.MAX_CHARS
+        # Only the first limit + 1 characters (one past the limit for the
+        # sentence-end lookahead) can reach the prompt, so oversized inputs
+        # are never copied in full.
+        if start == -1 or start > limit:
+            head = text[: limit + 1]
+        else:
+            head = (text[:start] + FALLO_PLACEHOLDER + text[end : end + limit + 1])[: limit + 1]
+        # Cut at the last paragraph break inside the limit so the prompt does
+        # not end mid-sentence, else after the last sentence end; fall back to
+        # a hard cut if either would drop more than half.
+        cut = head.rfind("\n\n", 0, limit)
+        if cut < limit // 2:
+            cut = limit
+            last = None
+            for last in _SENTENCE_END_RE.finditer(head, limit // 2, limit):
+                pass
+            if last is not None:
+                cut = last.end()
+        return head[:cut], True
 
     # ------------------------------------------------------------------
     # Helpers
@@ -155,67 +668,34 @@ class SimplificationService:
         }
 
     def _derive_decision_from_fallo(self, fallo_literal: str | None) -> Tuple[str, str]:
-        if not fallo_literal:
-            return "desconocido", "desconocido"
-
-        upper = fallo_literal.upper()
-        who = "desconocido"
-        if "SE ESTIMA PARCIAL" in upper or "ESTIMA PARCIAL" in upper:
-            who = "parcial"
-        elif "SE ESTIMA" in upper or "ESTIMA LA DEMANDA" in upper:
-            who = "actora"
-        elif "SE DESESTIMA" in upper or "DESESTIMA LA DEMANDA" in upper or "RECHAZA COMPLETAMENTE" in upper:
-            who = "demandado"
-
-        costs = "desconocido"
-        if "COSTAS A LA PARTE ACTORA" in upper or "COSTAS A LA ACTORA" in upper:
-            costs = "actora"
-        elif "COSTAS A LA PARTE DEMANDADA" in upper or "COSTAS A LA DEMANDADA" in upper:
-            costs = "demandado"
-        elif "SIN ESPECIAL PRONUNCIAMIENTO" in upper:
-            costs = "sin_costas"
-
-        return who.lower(), costs.lower()
+        return derive_decision_from_fallo(fallo_literal)
 
     def _render_simplified_text(self, data: Dict[str, Any], doc_type: str, doc_subtype: str) -> str:
         h = data.get("headerSummary", {})
         p = data.get("partiesSummary", {})
         d = data.get("decisionFallo", {})
 
-        lines = []
-        lines.append("[1] Datos del caso")
-        lines.append(f"- Fecha: {h.get('date','')}")
-        lines.append(f"- Juzgado: {h.get('court','')}")
-        lines.append(f"- Jueza/Juez: {h.get('judge','')}")
-        lines.append(f"- Numero de caso: {h.get('caseNumber','')}")
-        lines.append(f"- Numero de resolucion: {h.get('resolutionNumber','')}")
-        lines.append(f"- Tipo de documento: {doc_type} - {doc_subtype}")
-        lines.append("")
-
-        lines.append("[2] Partes involucradas")
-        lines.append(f"- Demandante: {p.get('plaintiff','')}")
-        if p.get("plaintiffRepresentatives"):
-            lines.append(f"  Representantes: {p.get('plaintiffRepresentatives','')}")
-        lines.append(f"- Demandado: {p.get('defendant','')}")
-        if p.get("defendantRepresentatives"):
-            lines.append(f"  Representantes: {p.get('defendantRepresentatives','')}")
-        lines.append("")
-
-        lines.append("[3] Lo que paso antes (contexto procesal)")
-        lines.append(data.get("proceduralContext") or "")
-        lines.append("")
-
-        lines.append("[4] Resultado del caso (segun el FALLO)")
-        lines.append(f"- Quien gana: {d.get('whoWins','desconocido')}")
-        lines.append(f"- Costas: {d.get('costs','desconocido')}")
-        lines.append(f"- Resumen breve: {d.get('plainText','')}")
-        if d.get("falloLiteral"):
-            lines.append("- Fallo literal:")
-            lines.append(d.get("falloLiteral"))
-        lines.append("")
-
-        # Resource info if present
-        return "\n".join(line for line in lines if line is not None).strip()
+        plaintiff_reps = p.get("plaintiffRepresentatives")
+        defendant_reps = p.get("defendantRepresentatives")
+        fallo_literal = d.get("falloLiteral")
+        return _SIMPLIFIED_TEMPLATE.format(
+            date=h.get("date", ""),
+            court=h.get("court", ""),
+            judge=h.get("judge", ""),
+            case_number=h.get("caseNumber", ""),
+            resolution_number=h.get("resolutionNumber", ""),
+            doc_type=doc_type,
+            doc_subtype=doc_subtype,
+            plaintiff=p.get("plaintiff", ""),
+            plaintiff_representatives=_REPRESENTATIVES_LINE.format(plaintiff_reps) if plaintiff_reps else "",
+            defendant=p.get("defendant", ""),
+            defendant_representatives=_REPRESENTATIVES_LINE.format(defendant_reps) if defendant_reps else "",
+            procedural_context=data.get("proceduralContext") or "",
+            who_wins=d.get("whoWins", "desconocido"),
+            costs=d.get("costs", "desconocido"),
+            plain_text=d.get("plainText", ""),
+            fallo_literal=_FALLO_LITERAL_LINES.format(fallo_literal) if fallo_literal else "",
+        ).strip()
 
     # ------------------------------------------------------------------
     # Strategy + important sections
@@ -223,19 +703,9 @@ class SimplificationService:
     @staticmethod
     def _select_strategy(doc_type: str, doc_subtype: str) -> str:
         doc_type_u = (doc_type or "").upper()
-        doc_subtype_u = (doc_subtype or "").upper()
-
-        if doc_type_u == "RESOLUCION_JURIDICA":
-            if doc_subtype_u in {"SENTENCIA", "AUTO", "DECRETO"}:
-                return "resolution"
-            return "resolution_generic"
-
-        if doc_type_u == "ESCRITO_PROCESAL":
-            if doc_subtype_u in {"DEMANDA", "RECURSO"}:
-                return "procedural_filing"
-            return "procedural_generic"
-
-        return "generic"
+        return _STRATEGY_BY_PAIR.get((doc_type_u, (doc_subtype or "").upper())) or _STRATEGY_BY_TYPE.get(
+            doc_type_u, "generic"
+        )
 
     @staticmethod
     def _important_sections(document: schemas.SegmentedDocument) -> List[schemas.DocumentSection]:
@@ -243,32 +713,23 @@ class SimplificationService:
             return []
 
         sections = document.sections
-        name_to_sections = {}
+        # One pass: the first section for each priority name, in priority order.
+        by_priority: Dict[str, schemas.DocumentSection | None] = dict.fromkeys(_IMPORTANT_SECTION_PRIORITY)
         for sec in sections:
-            name_to_sections.setdefault((sec.name or "").upper(), sec)
-
-        priority = [
-            "ENCABEZADO",
-            "ANTECEDENTES DE HECHO",
-            "FUNDAMENTOS DE DERECHO",
-            "FUNDAMENTOS JURIDICOS",
-            "FALLO",
-            "PETICIONES",
-        ]
-
-        selected: List[schemas.DocumentSection] = []
+            key = (sec.name or "").upper()
+            if key in by_priority and by_priority[key] is None:
+                by_priority[key] = sec
 
-        for key in priority:
-            sec = name_to_sections.get(key)
-            if sec and sec not in selected:
-                selected.append(sec)
-            if len(selected) >= 4:
-                break
+        # Each section has a single name, so these are already distinct.
+        selected = [sec for sec in by_priority.values() if sec is not None][:4]
 
         if len(selected) < 3:
+            # Identity set for O(1) membership while topping up to three.
+            selected_ids = {id(sec) for sec in selected}
             for sec in sections:
-                if sec not in selected:
+                if id(sec) not in selected_ids:
                     selected.append(sec)
+                    selected_ids.add(id(sec))
                 if len(selected) >= 3:
                     break
 
@@ -278,33 +739,22 @@ class SimplificationService:
     # Metadata grabbers
     # ------------------------------------------------------------------
     def _collect_metadata(self, document: schemas.SegmentedDocument) -> Dict[str, str]:
-        meta = {}
-        try:
-            extra = getattr(document.metadata, "extra", {}) if document.metadata else {}
-            meta["courtName"] = extra.get("courtName", "")
-            meta["city"] = extra.get("city", "")
-            meta["decisionDate"] = extra.get("decisionDate", "")
-            meta["caseNumber"] = extra.get("caseNumber", "")
-            meta["resolutionNumber"] = extra.get("resolutionNumber", "")
-            meta["procedureType"] = extra.get("procedureType", "")
-            meta["judgeName"] = extra.get("judgeName", "")
-        except Exception:
-            pass
-        return meta
+        extra = document.extra_meta
+        return {
+            "courtName": extra.get("courtName", ""),
+            "city": extra.get("city", ""),
+            "decisionDate": extra.get("decisionDate", ""),
+            "caseNumber": extra.get("caseNumber", ""),
+            "resolutionNumber": extra.get("resolutionNumber", ""),
+            "procedureType": extra.get("procedureType", ""),
+            "judgeName": extra.get("judgeName", ""),
+        }
 
     def _collect_parties(self, document: schemas.SegmentedDocument) -> Dict[str, str]:
-        parties: Dict[str, str] = {
-            "plaintiffName": "",
-            "plaintiffRepresentatives": "",
-            "defendantName": "",
-            "defendantRepresentatives": "",
+        extra = document.extra_meta
+        return {
+            "plaintiffName": extra.get("plaintiffName", ""),
+            "plaintiffRepresentatives": extra.get("plaintiffRepresentatives", ""),
+            "defendantName": extra.get("defendantName", ""),
+            "defendantRepresentatives": extra.get("defendantRepresentatives", ""),
         }
-        try:
-            extra = getattr(document.metadata, "extra", {}) if document.metadata else {}
-            parties["plaintiffName"] = extra.get("plaintiffName", "")
-            parties["plaintiffRepresentatives"] = extra.get("plaintiffRepresentatives", "")
-            parties["defendantName"] = extra.get("defendantName", "")
-            parties["defendantRepresentatives"] = extra.get("defendantRepresentatives", "")
-        except Exception:
-            pass
-        return parties
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import pytest
 
+from backend.clients import llm_client
 from backend.clients.llm_client import DeepSeekLLMClient, LLMClientError
 
 
@@ -39,7 +41,7 @@ def test_deepseek_classify_parses_payload(monkeypatch):
     def fake_post(*args, **kwargs):
         return MockResponse(payload)
 
-    monkeypatch.setattr("backend.clients.llm_client.requests.post", fake_post)
+    monkeypatch.setattr("backend.clients.llm_client.requests.Session.post", fake_post)
 
     client = DeepSeekLLMClient(settings=build_settings())
     result = client.classify("Sentencia con fallo.")
@@ -63,7 +65,7 @@ def test_deepseek_generate_guide(monkeypatch):
     def fake_post(*args, **kwargs):
         return MockResponse(payload)
 
-    monkeypatch.setattr("backend.clients.llm_client.requests.post", fake_post)
+    monkeypatch.setattr("backend.clients.llm_client.requests.Session.post", fake_post)
 
     client = DeepSeekLLMClient(settings=build_settings())
     guide = client.generate_guide("Texto", context={"doc_type": "RESOLUCION_JURIDICA"})
@@ -78,13 +80,57 @@ def test_deepseek_invalid_json(monkeypatch):
     def fake_post(*args, **kwargs):
         return MockResponse(payload)
 
-    monkeypatch.setattr("backend.clients.llm_client.requests.post", fake_post)
+    monkeypatch.setattr("backend.clients.llm_client.requests.Session.post", fake_post)
     client = DeepSeekLLMClient(settings=build_settings())
 
     with pytest.raises(LLMClientError):
         client.classify("texto")
 
 
+def test_deepseek_disk_cache_reuses_responses(monkeypatch, tmp_path):
+    calls = []
+    payload = {"choices": [{"message": {"content": "respuesta"}}]}
+
+    def fake_post(*args, **kwargs):
+        calls.append(kwargs["json"]["messages"][1]["content"])
+        return MockResponse(payload)
+
+    monkeypatch.setattr("backend.clients.llm_client.requests.Session.post", fake_post)
+    settings = {**build_settings(), "llm_cache_dir": str(tmp_path)}
+
+    assert DeepSeekLLMClient(settings=settings).chat("sistema", "usuario", 0.2) == "respuesta"
+    # A fresh client (new process in practice) reads the stored entry.
+    assert DeepSeekLLMClient(settings=settings).chat("sistema", "usuario", 0.2) == "respuesta"
+    DeepSeekLLMClient(settings=settings).chat("sistema", "otro", 0.2)
+
+    assert calls == ["usuario", "otro"]
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_deepseek_achat_reuses_one_pooled_client_per_loop(monkeypatch):
+    if llm_client.httpx is None:
+        pytest.skip("httpx not installed")
+    used = []
+    payload = {"choices": [{"message": {"content": "asincrono"}}]}
+
+    async def fake_post(self, url, **kwargs):
+        used.append(self)
+        return MockResponse(payload)
+
+    monkeypatch.setattr(llm_client.httpx.AsyncClient, "post", fake_post)
+    client = DeepSeekLLMClient(settings=build_settings())
+
+    async def run():
+        results = await asyncio.gather(*(client.achat("sistema", f"usuario {i}", 0.1) for i in range(3)))
+        await llm_client.aclose_async_http_client()
+        return results
+
+    assert asyncio.run(run()) == ["asincrono"] * 3
+    assert len({id(http) for http in used}) == 1
+    assert used[0].is_closed
+
+
 @pytest.mark.real_llm
 def test_deepseek_real_classification():
     api_key = os.getenv("LLM_API_KEY") or os.getenv("DEEPSEEK_API_KEY")
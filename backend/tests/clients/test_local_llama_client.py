@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import sys
+import types
+
+from backend.clients.local_llama_client import LocalLlamaCppClient
+
+
+class FakeLlama:
+    instances: list = []
+
+    def __init__(self, model_path, n_ctx, n_gpu_layers, verbose):
+        self.model_path = model_path
+        self.n_ctx = n_ctx
+        self.calls = []
+        FakeLlama.instances.append(self)
+
+    def create_chat_completion(self, **kwargs):
+        self.calls.append(kwargs)
+        content = '{"doc_type": "RESOLUCION_JURIDICA", "doc_subtype": "SENTENCIA", "confidence": 0.9, "rationale": "ok"}'
+        return {"choices": [{"message": {"content": content}}]}
+
+
+def test_local_client_routes_classification_to_small_model(monkeypatch):
+    FakeLlama.instances = []
+    monkeypatch.setitem(sys.modules, "llama_cpp", types.SimpleNamespace(Llama=FakeLlama))
+
+    client = LocalLlamaCppClient(
+        settings={
+            "llm_local_model_path": "big.gguf",
+            "llm_local_classification_model_path": "small.gguf",
+        }
+    )
+    result = client.classify("Sentencia con fallo.")
+    client.chat("system", "user", 0.3)
+
+    assert result.docSubtype == "SENTENCIA"
+    assert [model.model_path for model in FakeLlama.instances] == ["small.gguf", "big.gguf"]
+    assert FakeLlama.instances[0].n_ctx == 8192
+    assert FakeLlama.instances[0].calls[0]["response_format"] == {"type": "json_object"}
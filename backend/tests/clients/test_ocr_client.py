@@ -24,7 +24,15 @@ def test_extract_text_from_pdf(monkeypatch):
 
     service = ocr_client.OCRService()
     text = service.extract_text_from_pdf(b"pdf-bytes")
-    assert "Primera" in text and "Segunda" in text
+    assert text == "Primera pagina\n\nSegunda pagina"
+
+
+def test_extract_text_from_pdf_stops_at_max_chars(monkeypatch):
+    monkeypatch.setattr(ocr_client, "pypdf", types.SimpleNamespace(PdfReader=FakePdfReader))
+
+    service = ocr_client.OCRService()
+    text = service.extract_text_from_pdf(b"pdf-bytes", max_chars=5)
+    assert text == "Primera pagina"
 
 
 def test_extract_text_from_image(monkeypatch):
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import json
+
 from backend import schemas
+from backend.clients.llm_client import LLMClientError
 from backend.services.classification_service import ClassificationService
 
 
@@ -37,3 +40,99 @@ def test_classification_llm_fallback(fake_llm_client):
 
     assert result.docType == "ESCRITO_PROCESAL"
     assert result.source == "HYBRID"
+
+
+def test_classification_memoizes_repeated_documents(fake_llm_client, monkeypatch):
+    document = schemas.SegmentedDocument(
+        rawText="Documento sin palabras clave",
+        normalizedText="Documento sin palabras clave",
+        sections=[],
+    )
+    calls = []
+    original_classify = fake_llm_client.classify
+
+    def counting_classify(text, sections=None):
+        calls.append(text)
+        return original_classify(text, sections)
+
+    monkeypatch.setattr(fake_llm_client, "classify", counting_classify)
+
+    service = ClassificationService(
+        fake_llm_client, rule_threshold=0.8, force_llm_threshold=0.5, cache_enabled=True
+    )
+    first = service.classify(document)
+    second = service.classify(document.model_copy())
+    second.explanations.append("mutated by caller")
+    third = service.classify(document)
+
+    assert first == third
+    assert "mutated by caller" not in third.explanations
+    assert len(calls) == 1
+
+
+def test_classification_does_not_cache_rules_fallback_after_llm_failure(fake_llm_client, monkeypatch):
+    document = schemas.SegmentedDocument(
+        rawText="Documento sin palabras clave",
+        normalizedText="Documento sin palabras clave",
+        sections=[],
+    )
+    fake_llm_client.classification_result = schemas.ClassificationResult(
+        docType="ESCRITO_PROCESAL",
+        docSubtype="DEMANDA",
+        confidence=0.7,
+        source="LLM",
+        explanations=["LLM"],
+    )
+    calls = []
+    original_classify = fake_llm_client.classify
+
+    def flaky_classify(text, sections=None):
+        calls.append(text)
+        if len(calls) == 1:
+            raise LLMClientError("timeout")
+        return original_classify(text, sections)
+
+    def failing_chat(system_prompt, user_prompt, temperature):
+        raise LLMClientError("timeout")
+
+    monkeypatch.setattr(fake_llm_client, "classify", flaky_classify)
+    monkeypatch.setattr(fake_llm_client, "chat", failing_chat, raising=False)
+
+    service = ClassificationService(
+        fake_llm_client, rule_threshold=0.8, force_llm_threshold=0.5, cache_enabled=True
+    )
+    first = service.classify(document)
+    second = service.classify(document)
+    third = service.classify(document)
+
+    assert first.source == "RULES_ONLY"
+    assert second.source == "HYBRID"
+    assert third == second
+    assert len(calls) == 2
+
+
+def test_classification_on_raw_reports_single_llm_payload(fake_llm_client, monkeypatch):
+    document = schemas.SegmentedDocument(
+        rawText="Documento sin palabras clave",
+        normalizedText="Documento sin palabras clave",
+        sections=[],
+    )
+    raw_payload = '{"doc_type": "ESCRITO_PROCESAL", "doc_subtype": "DEMANDA", "confidence": 0.7}'
+    chat_calls = []
+
+    def fake_chat(system_prompt, user_prompt, temperature):
+        chat_calls.append(user_prompt)
+        return raw_payload
+
+    monkeypatch.setattr(fake_llm_client, "chat", fake_chat, raising=False)
+    monkeypatch.setattr(fake_llm_client, "_parse_json", json.loads, raising=False)
+
+    seen = []
+    service = ClassificationService(
+        fake_llm_client, rule_threshold=0.8, force_llm_threshold=0.5, cache_enabled=False
+    )
+    result = service.classify(document, on_raw=seen.append)
+
+    assert seen == [raw_payload]
+    assert len(chat_calls) == 1
+    assert result.docSubtype == "DEMANDA"
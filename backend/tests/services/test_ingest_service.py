@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import pytest
 
 from backend import schemas
+from backend.clients.ocr_client import OCRClientError
+from backend.services import ingest_service
 from backend.services.ingest_service import IngestService
 
+# Base64 body shared by the PDF ingestion tests.
+PDF_B64 = base64.b64encode(b"pdf-file").decode("utf-8")
+
 
 def test_ingest_text_returns_metadata(fake_ocr_service):
     service = IngestService(fake_ocr_service, default_language="es")
@@ -20,7 +26,7 @@ def test_ingest_text_returns_metadata(fake_ocr_service):
 
 def test_ingest_pdf_uses_ocr(fake_ocr_service):
     service = IngestService(fake_ocr_service, default_language="es")
-    pdf_bytes = base64.b64encode(b"pdf-file").decode("utf-8")
+    pdf_bytes = PDF_B64
     document_input = schemas.DocumentInput(sourceType="pdf", fileContent=pdf_bytes)
 
     result = service.ingest(document_input)
@@ -33,3 +39,140 @@ def test_ingest_invalid_source(fake_ocr_service):
     service = IngestService(fake_ocr_service)
     with pytest.raises(ValueError):
         service.ingest(schemas.DocumentInput(sourceType="unknown"))
+
+
+def test_ingest_many_preserves_order(fake_ocr_service):
+    service = IngestService(fake_ocr_service, default_language="es", max_concurrency=2)
+    pdf_bytes = PDF_B64
+    inputs = [
+        schemas.DocumentInput(sourceType="text", plainText="Uno"),
+        schemas.DocumentInput(sourceType="pdf", fileContent=pdf_bytes),
+        schemas.DocumentInput(sourceType="text", plainText="Tres"),
+    ]
+
+    results = asyncio.run(service.ingest_many(inputs))
+
+    assert [result.rawText for result in results] == ["Uno", fake_ocr_service.pdf_text, "Tres"]
+
+
+def test_ingest_pdf_retries_rate_limited_ocr(fake_ocr_service, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(ingest_service.time, "sleep", sleeps.append)
+    calls = []
+
+    def flaky_pdf(pdf_bytes, language=None):
+        calls.append(pdf_bytes)
+        if len(calls) < 3:
+            raise OCRClientError("HTTP 429 Too Many Requests")
+        return "PDF OK"
+
+    monkeypatch.setattr(fake_ocr_service, "extract_text_from_pdf", flaky_pdf)
+    service = IngestService(fake_ocr_service, ocr_backoff_base=1.0)
+    pdf_bytes = PDF_B64
+
+    result = service.ingest(schemas.DocumentInput(sourceType="pdf", fileContent=pdf_bytes))
+
+    assert result.rawText == "PDF OK"
+    assert sleeps == [1.0, 2.0]
+
+
+def test_ingest_pdf_does_not_retry_other_ocr_errors(fake_ocr_service, monkeypatch):
+    calls = []
+
+    def broken_pdf(pdf_bytes, language=None):
+        calls.append(pdf_bytes)
+        raise OCRClientError("corrupt file")
+
+    monkeypatch.setattr(fake_ocr_service, "extract_text_from_pdf", broken_pdf)
+    service = IngestService(fake_ocr_service)
+    pdf_bytes = PDF_B64
+
+    with pytest.raises(ValueError):
+        service.ingest(schemas.DocumentInput(sourceType="pdf", fileContent=pdf_bytes))
+    assert len(calls) == 1
+
+
+def test_ingest_pdf_does_not_retry_messages_merely_containing_rate(fake_ocr_service, monkeypatch):
+    calls = []
+
+    def broken_pdf(pdf_bytes, language=None):
+        calls.append(pdf_bytes)
+        raise OCRClientError("Could not generate image for separate page")
+
+    monkeypatch.setattr(fake_ocr_service, "extract_text_from_pdf", broken_pdf)
+    service = IngestService(fake_ocr_service)
+
+    with pytest.raises(ValueError):
+        service.ingest(schemas.DocumentInput(sourceType="pdf", fileContent=PDF_B64))
+    assert len(calls) == 1
+    assert IngestService._is_rate_limited(OCRClientError("Rate limit exceeded"))
+    assert IngestService._is_rate_limited(OCRClientError("rate-limited: quota exhausted"))
+
+
+def test_ingest_pdf_accepts_raw_bytes(fake_ocr_service, monkeypatch):
+    received = []
+
+    def capture_pdf(pdf_bytes, language=None):
+        received.append(pdf_bytes)
+        return "PDF OK"
+
+    monkeypatch.setattr(fake_ocr_service, "extract_text_from_pdf", capture_pdf)
+    service = IngestService(fake_ocr_service, ocr_cache_size=0)
+    raw_pdf = b"%PDF-1.7\n%binary"
+
+    service.ingest(schemas.DocumentInput(sourceType="pdf", fileContent=raw_pdf))
+    service.ingest(
+        schemas.DocumentInput(sourceType="pdf", fileContent=base64.b64encode(raw_pdf).decode("ascii"))
+    )
+
+    assert received == [raw_pdf, raw_pdf]
+
+
+def test_ingest_pdf_reuses_cached_ocr_text(fake_ocr_service, monkeypatch):
+    calls = []
+
+    def counting_pdf(pdf_bytes, language=None):
+        calls.append(pdf_bytes)
+        return "PDF OK"
+
+    monkeypatch.setattr(fake_ocr_service, "extract_text_from_pdf", counting_pdf)
+    service = IngestService(fake_ocr_service)
+    document_input = schemas.DocumentInput(sourceType="pdf", fileContent=b"%PDF-1.7 same file")
+
+    first = service.ingest(document_input)
+    second = service.ingest(document_input)
+
+    assert first.rawText == second.rawText == "PDF OK"
+    assert len(calls) == 1
+
+
+def test_ingest_pdf_spools_large_uploads_to_mmap(fake_ocr_service, monkeypatch):
+    received = []
+
+    def capture_pdf(source, language=None):
+        received.append((type(source).__name__, source[:]))
+        return "PDF OK"
+
+    monkeypatch.setattr(fake_ocr_service, "extract_text_from_pdf", capture_pdf)
+    service = IngestService(fake_ocr_service, spool_threshold=8)
+    raw_pdf = b"%PDF-1.7 large enough"
+
+    result = service.ingest(schemas.DocumentInput(sourceType="pdf", fileContent=raw_pdf))
+
+    assert received == [("mmap", raw_pdf)]
+    assert result.metadata.extra["bytes"] == str(len(raw_pdf))
+
+
+def test_ingest_decodes_base64_that_starts_like_a_gif_signature(fake_ocr_service, monkeypatch):
+    received = []
+
+    def capture_pdf(pdf_bytes, language=None):
+        received.append(pdf_bytes)
+        return "PDF OK"
+
+    monkeypatch.setattr(fake_ocr_service, "extract_text_from_pdf", capture_pdf)
+    service = IngestService(fake_ocr_service, ocr_cache_size=0)
+
+    service.ingest(schemas.DocumentInput(sourceType="pdf", fileContent="GIF8AAAA"))
+
+    assert received == [base64.b64decode("GIF8AAAA")]
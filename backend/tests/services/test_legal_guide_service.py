@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+
+from backend.prompt_templates import legal_guide as legal_guide_prompt
 from backend.services.legal_guide_service import LegalGuideService
 
 
@@ -9,3 +12,83 @@ def test_legal_guide_service_delegates(fake_llm_client, sample_segmented_documen
 
     assert guide.meaningForYou == "Resumen"
     assert guide.provider == "fake"
+
+
+def test_build_guides_batch_packs_requests_into_one_call(
+    fake_llm_client, sample_segmented_document, sample_classification_result, sample_simplification_result
+):
+    calls = []
+    guide_payload = {
+        "meaning_for_you": "Lote",
+        "what_to_do_now": "Acciones",
+        "what_happens_next": "Pasos",
+        "deadlines_and_risks": "Plazos",
+    }
+
+    def fake_chat(system_prompt, user_prompt, temperature):
+        calls.append(user_prompt)
+        return json.dumps({"guides": [guide_payload] * 4})
+
+    fake_llm_client.chat = fake_chat
+    fake_llm_client._parse_json = json.loads
+    service = LegalGuideService(fake_llm_client, cache_enabled=False)
+    items = [
+        (
+            sample_segmented_document,
+            sample_classification_result,
+            sample_simplification_result.model_copy(update={"simplifiedText": f"Texto {index}"}),
+        )
+        for index in range(4)
+    ]
+
+    guides = service.build_guides_batch(items)
+
+    assert len(calls) == 1
+    assert "DOCUMENTO 4" in calls[0]
+    assert [guide.meaningForYou for guide in guides] == ["Lote"] * 4
+
+
+def test_build_guide_forwards_decision_hints_to_prompt(
+    fake_llm_client, sample_segmented_document, sample_classification_result, sample_simplification_result
+):
+    prompts = []
+
+    def fake_chat(system_prompt, user_prompt, temperature):
+        prompts.append(user_prompt)
+        return json.dumps({"meaning_for_you": "Con fallo"})
+
+    fake_llm_client.chat = fake_chat
+    fake_llm_client._parse_json = json.loads
+    simplification = sample_simplification_result.model_copy(
+        update={"decisionFallo": {"whoWins": "actora", "costs": "demandado", "falloLiteral": "FALLO: se estima"}}
+    )
+    service = LegalGuideService(fake_llm_client, cache_enabled=False)
+
+    guide = service.build_guide(
+        sample_segmented_document, sample_classification_result, simplification, on_raw=lambda raw: None
+    )
+
+    assert guide.meaningForYou == "Con fallo"
+    assert "whoWins: actora" in prompts[0]
+    assert "falloLiteral: FALLO: se estima" in prompts[0]
+
+
+def test_legal_guide_prompt_starts_with_static_instructions():
+    first = legal_guide_prompt.user_prompt("Texto uno", {"doc_type": "A"}, {}, {})
+    second = legal_guide_prompt.user_prompt("Texto dos", {"doc_type": "B"}, {"whoWins": "actora"}, {})
+
+    prefix_length = len(legal_guide_prompt._USER_INSTRUCTIONS)
+    assert first[:prefix_length] == second[:prefix_length] == legal_guide_prompt._USER_INSTRUCTIONS
+    assert '"deadlines_and_risks"' in legal_guide_prompt._USER_INSTRUCTIONS
+
+
+def test_legal_guide_batch_prompts_share_a_static_prefix():
+    first = legal_guide_prompt.batch_user_prompt([("Texto uno", {"doc_type": "A"}, {}, {})] * 2)
+    second = legal_guide_prompt.batch_user_prompt(
+        [("Texto dos", {"doc_type": "B"}, {"whoWins": "actora"}, {})] * 3
+    )
+
+    prefix_length = len(legal_guide_prompt._BATCH_INSTRUCTIONS)
+    assert first[:prefix_length] == second[:prefix_length] == legal_guide_prompt._BATCH_INSTRUCTIONS
+    assert '"guides"' in legal_guide_prompt._BATCH_INSTRUCTIONS
+    assert "=== DOCUMENTO" not in legal_guide_prompt._BATCH_INSTRUCTIONS
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from backend import schemas
 from backend.services.normalization_service import NormalizationService
+from backend.utils import text_cleaning
 
 
 def test_normalization_cleans_text():
@@ -15,3 +16,66 @@ def test_normalization_cleans_text():
 
     assert "JUZGADO" in segmented.normalizedText
     assert segmented.sections[0].name == "ENCABEZADO"
+
+
+def test_normalization_orders_sections_by_first_keyword():
+    ingest_result = schemas.IngestResult(
+        rawText=(
+            "Juzgado de Primera Instancia\n"
+            "Antecedentes de hecho: primero.\n"
+            "Fundamentos juridicos: segundo.\n"
+            "Fallo: se estima la demanda."
+        ),
+        metadata=schemas.DocumentMetadata(sourceType="text"),
+    )
+
+    segmented = NormalizationService().normalize(ingest_result)
+
+    assert [section.name for section in segmented.sections] == [
+        "ENCABEZADO",
+        "ANTECEDENTES DE HECHO",
+        "FUNDAMENTOS DE DERECHO",
+        "FALLO",
+    ]
+    assert segmented.sections[-1].content.startswith("Fallo")
+    assert segmented.falloLiteral == "Fallo: se estima la demanda."
+    assert segmented.metadata.extra["falloLiteral"] == segmented.falloLiteral
+
+
+def test_clean_text_matches_chained_helpers():
+    raw = "JUZGADO  N\u00ba 5\r\n\r\n\r\n12\n\tdefend-\n  ant\n\n\n \nFALLO\t\tfinal  "
+    chained = text_cleaning.normalize_whitespace(
+        text_cleaning.remove_repeated_headers(text_cleaning.sanitize_characters(raw))
+    )
+
+    assert text_cleaning.clean_text(raw) == chained
+
+
+def test_extract_fallo_literal_span_trims_trailing_whitespace():
+    text = "Hechos. FALLO: se estima la demanda.  \n\n FIRMA del juez"
+    service = NormalizationService()
+
+    start, end = service.extract_fallo_literal_span(text)
+
+    assert text[start:end] == "FALLO: se estima la demanda."
+    assert service.extract_fallo_literal(text) == text[start:end]
+
+
+def test_segmented_document_caches_upper_text():
+    document = schemas.SegmentedDocument(rawText="Fallo", normalizedText="Fallo: se estima")
+
+    first = document.upper_text()
+
+    assert first == "FALLO: SE ESTIMA"
+    assert document.upper_text() is first
+    document.normalizedText = "Otro texto"
+    assert document.upper_text() == "OTRO TEXTO"
+
+
+def test_segmented_document_extra_meta_defaults_to_empty():
+    document = schemas.SegmentedDocument(rawText="r", normalizedText="r")
+
+    assert document.extra_meta == {}
+    document.metadata = schemas.DocumentMetadata(sourceType="text", extra={"caseNumber": "1/2024"})
+    assert document.extra_meta == {"caseNumber": "1/2024"}
+    assert "extra_meta" not in document.model_dump()
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import json
+
 from backend import schemas
 from backend.services.safety_check_service import SafetyCheckService
+from backend.services.simplification_service import derive_decision_from_fallo
+from backend.utils import date_amount_parsing
 
 
 def make_segmented(text: str) -> schemas.SegmentedDocument:
@@ -25,3 +29,194 @@ def test_safety_flags_detect_missing_amounts(fake_llm_client, sample_simplificat
     assert any(issue.code.startswith("MISSING_AMOUNT") for issue in result.issues)
     assert result.llmVerdict == "riesgo"
     assert result.isSafe is False
+
+
+def test_safety_verifier_reuses_cached_verdict(fake_llm_client, sample_simplification_result):
+    calls = []
+    fake_llm_client.safety_payload = {"is_safe": True, "warnings": [], "verdict": "ok"}
+    original_verify = fake_llm_client.verify_safety
+
+    def counting_verify(*args):
+        calls.append(args)
+        return original_verify(*args)
+
+    fake_llm_client.verify_safety = counting_verify
+    service = SafetyCheckService(fake_llm_client, cache_enabled=True)
+    original = make_segmented("Fallo: se estima la demanda.")
+
+    first = service.evaluate(original, sample_simplification_result, fake_llm_client.guide)
+    second = service.evaluate(original, sample_simplification_result, fake_llm_client.guide)
+
+    assert len(calls) == 1
+    assert first.llmVerdict == second.llmVerdict == "ok"
+
+
+def test_safety_cache_switch_honours_new_and_legacy_env_names(fake_llm_client, sample_simplification_result, monkeypatch):
+    calls = []
+    fake_llm_client.safety_payload = {"is_safe": True, "warnings": [], "verdict": "ok"}
+    original_verify = fake_llm_client.verify_safety
+
+    def counting_verify(*args):
+        calls.append(args)
+        return original_verify(*args)
+
+    fake_llm_client.verify_safety = counting_verify
+    original = make_segmented("Fallo: se estima la demanda.")
+    for name in ("JMC_CACHE_DISABLE", "JMC_CLASSIFY_CACHE_DISABLE"):
+        monkeypatch.delenv("JMC_CACHE_DISABLE", raising=False)
+        monkeypatch.delenv("JMC_CLASSIFY_CACHE_DISABLE", raising=False)
+        monkeypatch.setenv(name, "1")
+        service = SafetyCheckService(fake_llm_client)
+        service.evaluate(original, sample_simplification_result, fake_llm_client.guide)
+        service.evaluate(original, sample_simplification_result, fake_llm_client.guide)
+
+    assert len(calls) == 4
+
+
+def test_safety_skips_verifier_on_hard_rule_failure(fake_llm_client, sample_simplification_result):
+    def fail_verify(*args):
+        raise AssertionError("verifier should not be called")
+
+    fake_llm_client.verify_safety = fail_verify
+    service = SafetyCheckService(fake_llm_client, skip_llm_on_hard_fail=True)
+    original = make_segmented("Texto sin fallo literal.")
+
+    result = service.evaluate(original, sample_simplification_result, fake_llm_client.guide)
+
+    assert "MISSING_FALLO_LITERAL" in result.ruleBasedFlags
+    assert result.llmVerdict is None
+    assert result.isSafe is False
+
+
+def test_safety_flags_fallo_mismatch_and_skips_verifier(fake_llm_client, sample_simplification_result):
+    def fail_verify(*args):
+        raise AssertionError("verifier should not be called")
+
+    fake_llm_client.verify_safety = fail_verify
+    service = SafetyCheckService(fake_llm_client, skip_llm_on_hard_fail=True)
+    fallo = "FALLO: SE DESESTIMA LA DEMANDA. Sin especial pronunciamiento en costas."
+    original = make_segmented(fallo)
+    original.metadata = schemas.DocumentMetadata(sourceType="text", extra={"falloLiteral": fallo})
+    simplified = sample_simplification_result.model_copy(
+        update={"decisionFallo": {"whoWins": "actora", "costs": "demandado", "falloLiteral": fallo}}
+    )
+
+    result = service.evaluate(original, simplified, fake_llm_client.guide)
+
+    assert result.ruleBasedFlags == ["FALLO_POLARITY_MISMATCH", "FALLO_COSTS_MISMATCH"]
+    assert result.llmVerdict is None
+    assert result.isSafe is False
+
+
+def test_safety_accepts_matching_fallo_decision(fake_llm_client, sample_simplification_result):
+    service = SafetyCheckService(fake_llm_client, cache_enabled=False)
+    fallo = "FALLO: SE ESTIMA PARCIALMENTE LA DEMANDA. Sin especial pronunciamiento en costas."
+    original = make_segmented(fallo)
+    original.metadata = schemas.DocumentMetadata(sourceType="text", extra={"falloLiteral": fallo})
+    simplified = sample_simplification_result.model_copy(
+        update={"decisionFallo": {"whoWins": "parcial", "costs": "sin_costas", "falloLiteral": fallo}}
+    )
+
+    result = service.evaluate(original, simplified, fake_llm_client.guide)
+
+    assert result.ruleBasedFlags == []
+
+
+def test_safety_accepts_simplifier_decision_for_mixed_fallo(fake_llm_client, sample_simplification_result):
+    service = SafetyCheckService(fake_llm_client, cache_enabled=False, skip_llm_on_hard_fail=True)
+    fallo = (
+        "FALLO: Se estima la demanda interpuesta por la actora y se desestima la reconvencion. "
+        "Con imposicion de costas a la parte demandada."
+    )
+    original = make_segmented(fallo)
+    original.metadata = schemas.DocumentMetadata(sourceType="text", extra={"falloLiteral": fallo})
+    who, costs = derive_decision_from_fallo(fallo)
+    simplified = sample_simplification_result.model_copy(
+        update={"decisionFallo": {"whoWins": who, "costs": costs, "falloLiteral": fallo}}
+    )
+
+    result = service.evaluate(original, simplified, fake_llm_client.guide)
+
+    assert (who, costs) == ("actora", "demandado")
+    assert result.ruleBasedFlags == []
+
+
+def test_verifier_excerpt_keeps_fallo_of_long_documents():
+    fallo = "FALLO: se estima la demanda."
+    text = "Antecedentes. " * 1000 + fallo
+    original = schemas.SegmentedDocument(rawText=text, normalizedText=text, falloLiteral=fallo)
+
+    excerpt = SafetyCheckService._original_excerpt(original)
+
+    assert excerpt.startswith(fallo)
+    assert len(excerpt) <= 5000
+
+
+def test_evaluate_many_packs_verifier_calls_into_one_request(fake_llm_client, sample_simplification_result):
+    calls = []
+
+    def fake_chat(system_prompt, user_prompt, temperature):
+        calls.append(user_prompt)
+        return json.dumps({"results": [{"is_safe": True, "warnings": [], "verdict": "ok"}] * 4})
+
+    fake_llm_client.chat = fake_chat
+    fake_llm_client._parse_json = json.loads
+    service = SafetyCheckService(fake_llm_client, cache_enabled=False)
+    items = [
+        (make_segmented(f"Documento {index}"), sample_simplification_result, fake_llm_client.guide)
+        for index in range(4)
+    ]
+
+    results = service.evaluate_many(items)
+
+    assert len(calls) == 1
+    assert "DOCUMENTO 4" in calls[0]
+    assert [result.llmVerdict for result in results] == ["ok"] * 4
+
+
+def test_evaluate_many_falls_back_to_single_calls_on_garbled_batch(fake_llm_client, sample_simplification_result):
+    batch_calls = []
+    single_calls = []
+
+    def fake_chat(system_prompt, user_prompt, temperature):
+        batch_calls.append(user_prompt)
+        return "no-json"
+
+    def fake_verify_safety(original_text, simplified_text, legal_guide):
+        single_calls.append(original_text)
+        return {"is_safe": True, "warnings": [], "verdict": "ok"}
+
+    fake_llm_client.chat = fake_chat
+    fake_llm_client._parse_json = json.loads
+    fake_llm_client.verify_safety = fake_verify_safety
+    service = SafetyCheckService(fake_llm_client, cache_enabled=False)
+    items = [
+        (make_segmented(f"Documento {index}"), sample_simplification_result, fake_llm_client.guide)
+        for index in range(4)
+    ]
+
+    results = service.evaluate_many(items)
+
+    assert len(batch_calls) == 1
+    assert len(single_calls) == 4
+    assert [result.llmVerdict for result in results] == ["ok"] * 4
+
+
+def test_extract_all_matches_individual_extractors():
+    text = (
+        "Madrid, 10 de mayo de 2024. Autos 12/03/2023. Multa de $5.000 COP. "
+        "Cabe recurso en el plazo de 20 días hábiles."
+    )
+
+    found = date_amount_parsing.extract_all(text)
+
+    assert found["dates"] == date_amount_parsing.extract_dates(text) == ["12/03/2023", "10 de mayo de 2024"]
+    assert found["deadlines"] == date_amount_parsing.extract_deadlines(text)
+    assert found["amounts"] == date_amount_parsing.extract_amounts(text)
+
+
+def test_extractors_prefilters_keep_edge_matches():
+    # Amounts need no digit ("... pesos") and IGNORECASE folds the long s.
+    assert date_amount_parsing.extract_amounts("Deuda ... peſos") == [" ... peſos"]
+    assert date_amount_parsing.extract_all("Deuda ... peſos")["amounts"] == [" ... peſos"]
+    assert date_amount_parsing.extract_all("Sin fechas ni importes") == {"dates": [], "deadlines": [], "amounts": []}
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import json
+
+import pytest
+
 from backend import schemas
-from backend.services.simplification_service import SimplificationService
+from backend.prompt_templates import simplification as simplification_prompt
+from backend.services.simplification_service import FALLO_PLACEHOLDER, SimplificationService
 
 
 def build_document(text: str) -> schemas.SegmentedDocument:
@@ -44,3 +50,325 @@ def test_simplification_truncates_long_text(fake_llm_client):
 
     assert result.truncated is True
     assert "trunc" in result.warnings[0]
+
+
+def test_simplify_many_keeps_input_order(fake_llm_client):
+    service = SimplificationService(fake_llm_client, max_concurrency=2)
+    classifications = [
+        schemas.ClassificationResult(
+            docType="RESOLUCION_JURIDICA",
+            docSubtype=subtype,
+            confidence=0.9,
+            source="RULES_ONLY",
+            explanations=[],
+        )
+        for subtype in ("SENTENCIA", "AUTO", "DEMANDA")
+    ]
+    items = [(build_document(f"texto {index}"), classification) for index, classification in enumerate(classifications)]
+
+    results = service.simplify_many(items)
+
+    assert [result.docSubtype for result in results] == ["SENTENCIA", "AUTO", "DEMANDA"]
+
+
+def test_simplify_many_packs_short_documents_into_one_call(fake_llm_client):
+    calls = []
+    payload = {"proceduralContext": "Contexto", "decisionFallo": {"plainText": "Resumen"}}
+
+    def fake_chat(system_prompt, user_prompt, temperature):
+        calls.append(user_prompt)
+        return json.dumps({"documents": [payload] * 4})
+
+    fake_llm_client.chat = fake_chat
+    fake_llm_client._parse_json = json.loads
+    service = SimplificationService(fake_llm_client)
+    classification = schemas.ClassificationResult(
+        docType="RESOLUCION_JURIDICA",
+        docSubtype="SENTENCIA",
+        confidence=0.9,
+        source="RULES_ONLY",
+        explanations=[],
+    )
+    items = [(build_document(f"texto {index}"), classification) for index in range(4)]
+
+    results = service.simplify_many(items)
+
+    assert len(calls) == 1
+    assert "DOCUMENTO 4" in calls[0]
+    assert all(result.proceduralContext == "Contexto" for result in results)
+
+
+def test_simplify_reuses_cached_payload_for_identical_prompt(fake_llm_client):
+    calls = []
+
+    def fake_chat(system_prompt, user_prompt, temperature):
+        calls.append(user_prompt)
+        return json.dumps({"proceduralContext": "Contexto"})
+
+    fake_llm_client.chat = fake_chat
+    fake_llm_client._parse_json = json.loads
+    service = SimplificationService(fake_llm_client, cache_enabled=True)
+    classification = schemas.ClassificationResult(
+        docType="RESOLUCION_JURIDICA",
+        docSubtype="SENTENCIA",
+        confidence=0.9,
+        source="RULES_ONLY",
+        explanations=[],
+    )
+
+    first = service.simplify(build_document("texto"), classification)
+    second = service.simplify(build_document("texto"), classification)
+
+    assert len(calls) == 1
+    assert first.proceduralContext == second.proceduralContext == "Contexto"
+
+
+def test_prompt_text_truncates_at_paragraph_boundary(fake_llm_client):
+    service = SimplificationService(fake_llm_client)
+    paragraph = "b" * 999
+    text = "\n\n".join([paragraph] * 14)
+
+    prompt_text, truncated = service._prompt_text(build_document(text))
+
+    assert truncated is True
+    assert len(prompt_text) <= service.MAX_CHARS
+    assert prompt_text.endswith(paragraph)
+
+
+def test_simplify_iter_yields_every_index(fake_llm_client):
+    service = SimplificationService(fake_llm_client, max_concurrency=2)
+    classification = schemas.ClassificationResult(
+        docType="RESOLUCION_JURIDICA",
+        docSubtype="SENTENCIA",
+        confidence=0.9,
+        source="RULES_ONLY",
+        explanations=[],
+    )
+    items = [(build_document(f"texto {index}"), classification) for index in range(3)]
+
+    results = dict(service.simplify_iter(items))
+
+    assert sorted(results) == [0, 1, 2]
+    assert all(result.strategy == "resolution" for result in results.values())
+
+
+def test_simplify_many_simplifies_duplicates_once(fake_llm_client):
+    calls = []
+
+    def fake_chat(system_prompt, user_prompt, temperature):
+        calls.append(user_prompt)
+        return json.dumps({"proceduralContext": "Contexto"})
+
+    fake_llm_client.chat = fake_chat
+    fake_llm_client._parse_json = json.loads
+    service = SimplificationService(fake_llm_client, cache_enabled=False)
+    classification = schemas.ClassificationResult(
+        docType="RESOLUCION_JURIDICA",
+        docSubtype="SENTENCIA",
+        confidence=0.9,
+        source="RULES_ONLY",
+        explanations=[],
+    )
+    items = [(build_document("mismo texto"), classification) for _ in range(3)]
+
+    results = service.simplify_many(items)
+
+    assert len(calls) == 1
+    assert len(results) == 3
+    assert results[0] is not results[1]
+    assert results[1].proceduralContext == "Contexto"
+
+
+def test_derive_decision_reads_desestima_as_defendant_win(fake_llm_client):
+    service = SimplificationService(fake_llm_client)
+
+    assert service._derive_decision_from_fallo("FALLO: Desestima la demanda, con costas a la actora.") == (
+        "demandado",
+        "actora",
+    )
+    assert service._derive_decision_from_fallo("Se estima parcialmente la demanda.") == ("parcial", "desconocido")
+
+
+def test_asimplify_many_keeps_input_order(fake_llm_client):
+    service = SimplificationService(fake_llm_client, max_concurrency=2)
+    classifications = [
+        schemas.ClassificationResult(
+            docType="ESCRITO_PROCESAL",
+            docSubtype=subtype,
+            confidence=0.9,
+            source="RULES_ONLY",
+            explanations=[],
+        )
+        for subtype in ("DEMANDA", "RECURSO", "OTRO")
+    ]
+    items = [(build_document(f"texto {index}"), classification) for index, classification in enumerate(classifications)]
+
+    results = asyncio.run(service.asimplify_many(items))
+
+    assert [result.docSubtype for result in results] == ["DEMANDA", "RECURSO", "OTRO"]
+
+
+def test_asimplify_awaits_client_achat(fake_llm_client):
+    calls = []
+
+    async def fake_achat(system_prompt, user_prompt, temperature):
+        calls.append(user_prompt)
+        return json.dumps({"decisionFallo": {"plainText": "Asincrono"}})
+
+    fake_llm_client.achat = fake_achat
+    fake_llm_client._parse_json = json.loads
+    service = SimplificationService(fake_llm_client, cache_enabled=False)
+    classification = schemas.ClassificationResult(
+        docType="RESOLUCION_JURIDICA", docSubtype="SENTENCIA", confidence=0.9, source="RULES_ONLY", explanations=[]
+    )
+
+    result = asyncio.run(service.asimplify(build_document("texto asincrono"), classification))
+
+    assert len(calls) == 1
+    assert "texto asincrono" in calls[0]
+    assert result.decisionFallo["plainText"] == "Asincrono"
+
+
+def test_asimplify_coalesces_identical_in_flight_calls(fake_llm_client):
+    calls = []
+
+    async def fake_achat(system_prompt, user_prompt, temperature):
+        calls.append(user_prompt)
+        await asyncio.sleep(0.01)
+        return json.dumps({"proceduralContext": "Compartido"})
+
+    fake_llm_client.achat = fake_achat
+    fake_llm_client._parse_json = json.loads
+    service = SimplificationService(fake_llm_client, cache_enabled=False)
+    classification = schemas.ClassificationResult(
+        docType="OTRO", docSubtype="DESCONOCIDO", confidence=0.5, source="RULES_ONLY", explanations=[]
+    )
+
+    async def run():
+        return await asyncio.gather(
+            *(service.asimplify(build_document("mismo texto"), classification) for _ in range(3))
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [result.proceduralContext for result in results] == ["Compartido"] * 3
+
+
+def test_asimplify_cancelled_caller_does_not_cancel_shared_call(fake_llm_client):
+    calls = []
+
+    async def fake_achat(system_prompt, user_prompt, temperature):
+        calls.append(user_prompt)
+        await asyncio.sleep(0.02)
+        return json.dumps({"proceduralContext": "Superviviente"})
+
+    fake_llm_client.achat = fake_achat
+    fake_llm_client._parse_json = json.loads
+    service = SimplificationService(fake_llm_client, cache_enabled=False)
+    classification = schemas.ClassificationResult(
+        docType="OTRO", docSubtype="DESCONOCIDO", confidence=0.5, source="RULES_ONLY", explanations=[]
+    )
+
+    async def run():
+        first = asyncio.create_task(service.asimplify(build_document("mismo texto"), classification))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(service.asimplify(build_document("mismo texto"), classification))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    result = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert result.proceduralContext == "Superviviente"
+
+
+def test_simplify_degrades_on_llm_errors_but_raises_bugs(fake_llm_client):
+    service = SimplificationService(fake_llm_client, cache_enabled=False)
+    classification = schemas.ClassificationResult(
+        docType="OTRO", docSubtype="DESCONOCIDO", confidence=0.5, source="RULES_ONLY", explanations=[]
+    )
+
+    fake_llm_client.chat = lambda system_prompt, user_prompt, temperature: "no es json"
+    result = service.simplify(build_document("texto"), classification)
+    assert result.decisionFallo["whoWins"] == "desconocido"
+
+    def broken_chat(system_prompt, user_prompt, temperature):
+        raise TypeError("bug")
+
+    fake_llm_client.chat = broken_chat
+    with pytest.raises(TypeError):
+        service.simplify(build_document("texto"), classification)
+
+
+def test_simplify_skips_llm_when_fallo_and_metadata_are_complete(fake_llm_client):
+    calls = []
+
+    def fake_chat(system_prompt, user_prompt, temperature):
+        calls.append(user_prompt)
+        return json.dumps({"proceduralContext": "Resumen del LLM"})
+
+    fake_llm_client.chat = fake_chat
+    fake_llm_client._parse_json = json.loads
+    document = build_document("FALLO: Se estima la demanda con costas a la demandada.")
+    document.falloLiteral = "FALLO: Se estima la demanda con costas a la demandada."
+    document.metadata = schemas.DocumentMetadata(
+        sourceType="text",
+        extra={
+            "courtName": "Juzgado de Primera Instancia 1",
+            "decisionDate": "2024-01-10",
+            "caseNumber": "123/2023",
+            "plaintiffName": "Ana",
+            "defendantName": "Banco",
+        },
+    )
+    classification = schemas.ClassificationResult(
+        docType="RESOLUCION_JURIDICA", docSubtype="SENTENCIA", confidence=0.9, source="RULES_ONLY", explanations=[]
+    )
+
+    result = SimplificationService(fake_llm_client, cache_enabled=False).simplify(document, classification)
+
+    assert calls == []
+    assert result.provider == "deterministic"
+    assert result.headerSummary["court"] == "Juzgado de Primera Instancia 1"
+    assert result.decisionFallo["whoWins"] == "actora"
+
+    forced = SimplificationService(fake_llm_client, cache_enabled=False, force_llm=True).simplify(
+        document, classification
+    )
+
+    assert len(calls) == 1
+    assert forced.proceduralContext == "Resumen del LLM"
+
+
+def test_prompt_text_falls_back_to_sentence_boundary(fake_llm_client):
+    service = SimplificationService(fake_llm_client)
+    text = "Frase de prueba numero uno. " * 500
+
+    prompt_text, truncated = service._prompt_text(build_document(text))
+
+    assert truncated is True
+    assert len(prompt_text) <= service.MAX_CHARS
+    assert prompt_text.endswith("uno.")
+
+
+def test_prompt_text_elides_long_fallo_literal(fake_llm_client):
+    service = SimplificationService(fake_llm_client)
+    fallo = "FALLO: se estima la demanda. " * 10
+    document = build_document("Antecedentes. " + fallo + "Firma.")
+
+    prompt_text, truncated = service._prompt_text(document, fallo)
+
+    assert prompt_text == "Antecedentes. " + FALLO_PLACEHOLDER + "Firma."
+    assert truncated is False
+
+
+def test_simplification_prompts_share_a_static_prefix():
+    first = simplification_prompt.user_prompt("texto uno", "RESOLUCION_JURIDICA", "SENTENCIA", "FALLO: uno")
+    second = simplification_prompt.user_prompt("texto dos", "ESCRITO_PROCESAL", "DEMANDA", None)
+
+    prefix_length = len(simplification_prompt._USER_INSTRUCTIONS)
+    assert first[:prefix_length] == second[:prefix_length] == simplification_prompt._USER_INSTRUCTIONS
@@ -10,7 +10,7 @@ from backend.services.classification_service import ClassificationService
 from backend.services.simplification_service import SimplificationService
 from backend.services.legal_guide_service import LegalGuideService
 from backend.services.safety_check_service import SafetyCheckService
-from backend import schemas
+from backend import config, dependencies, schemas
 
 
 def test_pipeline_with_fake_client():
@@ -35,3 +35,34 @@ def test_pipeline_with_fake_client():
 
     safety = safety_service.evaluate(doc, simplification, guide)
     assert isinstance(safety.isSafe, bool)
+
+
+def test_providers_share_service_instances_across_requests():
+    settings = config.Settings(llm_api_key="test-key")
+    client = FakeLLMClient({})
+
+    first = dependencies.get_classification_service(settings=settings, llm_client_instance=client)
+    second = dependencies.get_classification_service(settings=settings, llm_client_instance=client)
+    other = dependencies.get_classification_service(settings=settings, llm_client_instance=FakeLLMClient({}))
+
+    assert first is second
+    assert other is not first
+    assert dependencies.get_legal_guide_service(llm_client_instance=client) is dependencies.get_legal_guide_service(
+        llm_client_instance=client
+    )
+    assert dependencies.get_simplification_service(llm_client_instance=client) is (
+        dependencies.get_simplification_service(llm_client_instance=client)
+    )
+    assert dependencies.get_safety_check_service(llm_client_instance=client) is (
+        dependencies.get_safety_check_service(llm_client_instance=client)
+    )
+
+
+def test_ingest_provider_keeps_ocr_cache_across_requests():
+    settings = config.Settings(llm_api_key="test-key")
+    ocr_service = dependencies.get_ocr_service(settings=settings)
+
+    assert dependencies.get_ocr_service(settings=settings) is ocr_service
+    assert dependencies.get_ingest_service(settings=settings, ocr_service=ocr_service) is (
+        dependencies.get_ingest_service(settings=settings, ocr_service=ocr_service)
+    )
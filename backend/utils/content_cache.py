@@ -0,0 +1,105 @@
+"""Content-addressed keys for memoizing pipeline results."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+# Setting this environment variable to "1" turns off in-process memoization
+# of classification, simplification, guide and verifier results (useful when
+# iterating on prompts). The classification-specific name it started as is
+# still honoured.
+CACHE_DISABLE_ENV = "JMC_CACHE_DISABLE"
+LEGACY_CACHE_DISABLE_ENV = "JMC_CLASSIFY_CACHE_DISABLE"
+
+
+def cache_enabled_from_env() -> bool:
+    """Return False when memoization was disabled through the environment."""
+    return os.getenv(CACHE_DISABLE_ENV, os.getenv(LEGACY_CACHE_DISABLE_ENV)) != "1"
+
+
+def content_key(*parts: str | None) -> bytes:
+    """Return a compact BLAKE2b digest identifying the given text parts.
+
+    Parts are separated with a NUL byte so ("ab", "c") and ("a", "bc") never
+    collide. ``None`` is treated as an empty string.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for index, part in enumerate(parts):
+        if index:
+            digest.update(b"\x00")
+        digest.update((part or "").encode("utf-8"))
+    return digest.digest()
+
+
+class LRUCache(Generic[V]):
+    """Small thread-safe least-recently-used mapping; ``maxsize <= 0`` disables it."""
+
+    def __init__(self, maxsize: int = 256):
+        self._maxsize = maxsize
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskCache:
+    """Directory of JSON files keyed by ``content_key`` digests.
+
+    Used to memoize raw LLM responses across processes (test harness, dev
+    loops). Writes go to a temporary file in the same directory and are
+    published with ``os.replace`` so concurrent readers never see a partial
+    entry; unreadable entries count as misses.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: bytes) -> Path:
+        return self._dir / f"{key.hex()}.json"
+
+    def get(self, key: bytes) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as handle:
+                value = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        return value if isinstance(value, str) else None
+
+    def put(self, key: bytes, value: str) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(value, handle, ensure_ascii=False)
+            os.replace(tmp_name, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
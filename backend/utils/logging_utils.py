@@ -1,6 +1,7 @@
 ﻿"""Logging utilities for pipeline observability."""
 from __future__ import annotations
 
+import functools
 import logging
 import sys
 from typing import Final, Optional
@@ -27,6 +28,9 @@ def setup_logging(level: int = logging.INFO) -> None:
         logger.addHandler(console_handler)
 
 
+# logging.getLogger already returns one instance per name; the cache only
+# skips rebuilding the dotted name on every call.
+@functools.lru_cache(maxsize=None)
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """Return a module-specific or main application logger."""
     if name:
@@ -17,15 +17,16 @@ import os
 from contextlib import nullcontext
 from pathlib import Path
 from pprint import pprint
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 from unittest.mock import patch
 
 import requests
 
 from backend import config, schemas
-from backend.clients.llm_client import LLMClient
+from backend.clients import llm_client
 from backend.services.classification_service import ClassificationService
 from backend.services.legal_guide_service import LegalGuideService
+from backend.services.normalization_service import NormalizationService
 from backend.services.safety_check_service import SafetyCheckService
 from backend.services.simplification_service import SimplificationService
 
@@ -36,53 +37,79 @@ DEFAULT_PDF = Path("Documents/Documentos jurídicos/SJPI_281_2025.pdf")
 class _MockResponse:
     """Simple stand-in for requests.Response."""
 
+    __slots__ = ("_payload", "status_code", "ok")
+
     def __init__(self, payload: Dict[str, Any], status_code: int = 200):
         self._payload = payload
         self.status_code = status_code
+        self.ok = 200 <= status_code < 300
 
     def json(self) -> Dict[str, Any]:
         return self._payload
 
     def raise_for_status(self) -> None:
-        if not 200 <= self.status_code < 300:
+        if not self.ok:
             raise requests.HTTPError(f"Mock DeepSeek error {self.status_code}")
 
 
-def _fake_deepseek_post(url: str, json: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None, timeout: int = 60):
-    """Return deterministic responses based on the DeepSeek system prompt."""
-
-    payload = json or {}
-    messages: List[Dict[str, str]] = payload.get("messages", [])
-    system_prompt = messages[0]["content"] if messages else ""
-
-    if "CLASIFICAR" in system_prompt:
-        content = jsonlib.dumps(
+# (system-prompt marker, canned JSON reply), checked in order; serialized once
+# at import since every mocked call returns the same content.
+_MOCK_REPLIES = (
+    (
+        "CLASIFICAR",
+        jsonlib.dumps(
             {
                 "doc_type": "RESOLUCION_JURIDICA",
                 "doc_subtype": "SENTENCIA",
                 "confidence": 0.82,
             }
-        )
-    elif "Lenguaje Jurídico Claro" in system_prompt:
-        content = "Este es un resumen claro y sencillo del texto legal original."
-    elif "asistente jurídico" in system_prompt:
-        content = jsonlib.dumps(
+        ),
+    ),
+    (
+        "Lenguaje Juridico Claro",
+        jsonlib.dumps(
+            {
+                "headerSummary": {"court": "Juzgado de Primera Instancia", "caseNumber": "123/2023"},
+                "partiesSummary": {"plaintiff": "Parte actora", "defendant": "Parte demandada"},
+                "proceduralContext": "La parte actora reclamo una cantidad a la demandada.",
+                "decisionFallo": {"plainText": "Se condena al pago de 3.000 euros mas intereses."},
+            }
+        ),
+    ),
+    (
+        "asistente jur",  # legal guide (client and service prompts)
+        jsonlib.dumps(
             {
                 "meaning_for_you": "La sentencia confirma parcialmente su reclamación.",
                 "what_to_do_now": "Revise los plazos para apelar si no está conforme.",
                 "what_happens_next": "El juzgado notificará a las partes y se abrirá plazo de recursos.",
                 "deadlines_and_risks": "Tiene 20 días hábiles para presentar recurso de apelación.",
             }
-        )
-    elif "revisor jurídico" in system_prompt:
-        content = jsonlib.dumps({"is_safe": True, "warnings": []})
+        ),
+    ),
+    ("revisor jurídico", jsonlib.dumps({"is_safe": True, "warnings": []})),
+)
+
+
+def _fake_deepseek_post(url: str, json: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None, timeout: int = 60):
+    """Return deterministic responses based on the DeepSeek system prompt."""
+
+    payload = json or {}
+    messages: List[Dict[str, str]] = payload.get("messages", [])
+    system_prompt = messages[0]["content"] if messages else ""
+
+    for marker, content in _MOCK_REPLIES:
+        if marker in system_prompt:
+            break
     else:
         raise RuntimeError("Mock DeepSeek handler no reconoce el prompt recibido.")
 
     response_payload = {"choices": [{"message": {"content": content}}]}
     return _MockResponse(response_payload)
 
-def _load_pdf_text(pdf_path: Path) -> str:
+
+def _iter_pdf_text(pdf_path: Path) -> Iterator[str]:
+    """Yield each page's text, newline-separated, without keeping earlier pages."""
     try:
         from pypdf import PdfReader
     except ImportError as exc:  # pragma: no cover - handled via runtime error message
@@ -93,13 +120,14 @@ def _load_pdf_text(pdf_path: Path) -> str:
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF not found at {pdf_path}")
 
-    reader = PdfReader(str(pdf_path))
-    text_chunks: List[str] = []
-    for page in reader.pages:
-        extracted = page.extract_text() or ""
-        text_chunks.append(extracted)
+    for index, page in enumerate(PdfReader(str(pdf_path)).pages):
+        if index:
+            yield "\n"
+        yield page.extract_text() or ""
 
-    text = "\n".join(text_chunks).strip()
+
+def _load_pdf_text(pdf_path: Path) -> str:
+    text = "".join(_iter_pdf_text(pdf_path)).strip()
     if not text:
         raise ValueError(f"No text could be extracted from {pdf_path}")
     return text
@@ -123,18 +151,25 @@ def _infer_sections(text: str) -> List[str]:
 
 def _build_document(mode: str, pdf_path: Path) -> schemas.SegmentedDocument:
     if mode == "fake":
-        return schemas.SegmentedDocument(
-            normalizedText=(
-                "SENTENCIA Nº 123/2023. La parte demandada dispone de 20 días hábiles para recurrir. "
-                "Se condena al pago de 3.000 euros más intereses."
-            ),
-            sections=["Antecedentes de Hecho", "Fundamentos de Derecho", "Fallo"],
+        text = (
+            "SENTENCIA Nº 123/2023. La parte demandada dispone de 20 días hábiles para recurrir. "
+            "FALLO: Se condena al pago de 3.000 euros más intereses."
         )
+        sections = ["Antecedentes de Hecho", "Fundamentos de Derecho", "Fallo"]
+    else:
+        text = _load_pdf_text(pdf_path)
+        sections = _infer_sections(text)
 
-    text = _load_pdf_text(pdf_path)
+    fallo = NormalizationService().extract_fallo_literal(text)
     return schemas.SegmentedDocument(
+        rawText=text,
         normalizedText=text,
-        sections=_infer_sections(text),
+        sections=[schemas.DocumentSection(name=name) for name in sections],
+        metadata=schemas.DocumentMetadata(
+            sourceType="text" if mode == "fake" else "pdf",
+            extra={"falloLiteral": fallo} if fallo else {},
+        ),
+        falloLiteral=fallo,
     )
 
 
@@ -149,29 +184,39 @@ def run_pipeline(mode: str, pdf_path: Path) -> Dict[str, Any]:
     settings = config.get_settings_dict(cfg)
     if not settings.get("llm_api_key"):
         settings["llm_api_key"] = os.getenv("DEEPSEEK_API_KEY") or "sk-placeholder-demo-token"
-    client = LLMClient(settings)
+    client = llm_client.DeepSeekLLMClient(settings)
 
-    classifier = ClassificationService(client)
+    classifier = ClassificationService(
+        client,
+        rule_threshold=cfg.classification_rule_threshold,
+        force_llm_threshold=cfg.classification_force_llm_threshold,
+    )
     simplifier = SimplificationService(client)
     guide_builder = LegalGuideService(client)
     safety = SafetyCheckService(client)
 
     document = _build_document(mode, pdf_path)
-    patch_ctx = patch("requests.post", side_effect=_fake_deepseek_post) if mode == "fake" else nullcontext()
+    # DeepSeekLLMClient posts through the shared module-level session.
+    patch_ctx = (
+        patch.object(llm_client._HTTP_SESSION, "post", side_effect=_fake_deepseek_post)
+        if mode == "fake"
+        else nullcontext()
+    )
 
+    # Each step consumes the previous one's output, so the calls stay in
+    # order; SafetyCheckService.evaluate already runs its rule checks
+    # alongside the verifier call.
     with patch_ctx:
-        classification = classifier.classifyWithLLM(document)
+        classification = classifier.classify(document)
         simplification = simplifier.simplify(document, classification)
-        guide = guide_builder.buildGuide(simplification)
-        safety_rules = safety.ruleBasedCheck(document, simplification)
-        safety_llm = safety.llmVerification(document, simplification, guide)
+        guide = guide_builder.build_guide(document, classification, simplification)
+        safety_result = safety.evaluate(document, simplification, guide)
 
     return {
         "classification": classification.model_dump(),
         "simplification": simplification.model_dump(),
         "guide": guide.model_dump(),
-        "rule_based_warnings": safety_rules.model_dump(),
-        "llm_warnings": safety_llm.model_dump(),
+        "safety": safety_result.model_dump(),
     }
 
 